@@ -0,0 +1,25 @@
+// Clientside-Callbacks für den Jahreswechsel (siehe clientside.py).
+// Setzt die Figuren eines Jahres aus der Basisfigur und den Jahresabweichungen zusammen.
+// Argumente: alle Eingabewerte (Jahr, ggf. weitere), zuletzt der Store-Inhalt.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    trade: {
+        figures: function() {
+            var args = Array.prototype.slice.call(arguments);
+            var payload = args.pop();
+            var key = args.map(String).join('|');
+            if (!payload || !payload.years[key]) {
+                return window.dash_clientside.no_update;
+            }
+            var figures = payload.years[key].map(function(delta, i) {
+                var base = payload.base[i];
+                return {
+                    data: delta.data.map(function(trace, j) {
+                        return Object.assign({}, base.data[j] || {}, trace);
+                    }),
+                    layout: Object.assign({}, base.layout, delta.layout)
+                };
+            });
+            return payload.multi ? figures : figures[0];
+        }
+    }
+});
@@ -0,0 +1,67 @@
+# Achsenticks und -beschriftungen für Euro-Werte.
+#
+# ticks() rundet den Wertebereich auf Vielfache der Schrittweite, legt die
+# Ticks dazwischen und beschriftet sie mit deutschen Einheiten (Mrd, Mio, Tsd).
+# Beschriftungen werden mit NumPy für alle Ticks auf einmal erzeugt. Da viele
+# Jahre auf denselben gerundeten Bereich fallen, wird das Ergebnis pro
+# (Bereich, Schrittweite) zwischengespeichert.
+import functools
+import math
+
+import numpy as np
+
+# (Schwelle, Einheit), absteigend
+UNITS = [(1e9, 'Mrd'), (1e6, 'Mio'), (1e3, 'Tsd')]
+
+EMPTY = np.empty(0)
+EMPTY.flags.writeable = False
+
+
+# Beschriftungen für beliebige Werte, z. B. 25e9 -> '25 Mrd', -3e6 -> '-3 Mio',
+# 1.5e9 -> '1,5 Mrd', 0 -> '0'
+def labels(values):
+    values = np.asarray(values, dtype=float)
+    magnitude = np.abs(values)
+    conditions = [magnitude >= threshold for threshold, _ in UNITS]
+    scale = np.select(conditions, [threshold for threshold, _ in UNITS], 1.0)
+    suffix = np.select(conditions, [f' {unit}' for _, unit in UNITS], '')
+    numbers = np.round(values / scale, 1)
+    whole = np.rint(numbers)
+    # Ganze Zahlen ohne Nachkommastelle, sonst eine Stelle mit Komma (1,5 Mrd)
+    text = np.where(numbers == whole, whole.astype(np.int64).astype(str),
+                    np.char.replace(np.char.mod('%.1f', numbers), '.', ','))
+    return np.char.add(text, suffix).tolist()
+
+
+@functools.lru_cache(maxsize=1024)
+def _ticks(first, last, step):
+    values = step * np.arange(first, last + 1, dtype=float)
+    values.flags.writeable = False
+    return values, tuple(labels(values))
+
+
+# (Tickwerte, Beschriftungen) von floor(low) bis ceil(high), beide auf
+# Vielfache von align (Standard: step) gerundet, im Abstand step.
+# Bei fehlenden Werten (NaN) gibt es keine Ticks.
+def ticks(low, high, step, align=None):
+    align = align or step
+    if not (math.isfinite(low) and math.isfinite(high)):
+        return EMPTY, []
+    first = round(math.floor(low / align) * align / step)
+    last = round(math.ceil(high / align) * align / step)
+    values, text = _ticks(first, last, float(step))
+    return values, list(text)
+
+
+# Schrittweite 1, 2 oder 5 mal einer Zehnerpotenz, mit der höchstens count
+# Schritte den Bereich abdecken (für Achsen, deren Größenordnung je nach
+# Auswahl stark schwankt)
+def step(low, high, count=6):
+    span = high - low
+    if not (math.isfinite(span) and span > 0):
+        return 1.0
+    base = 10.0 ** math.floor(math.log10(span / count))
+    for factor in (1, 2, 5):
+        if factor * base * count >= span:
+            return factor * base
+    return 10 * base
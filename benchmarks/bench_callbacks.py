@@ -0,0 +1,200 @@
+# Latenz aller Jahres-Callbacks der Graph-Module.
+#
+# Jeder Callback wird direkt (ohne figure_cache) für jedes verfügbare Jahr
+# (bzw. jeden Wert der Spalte PAGE['key'], z. B. jedes Land) aufgerufen. Gemessen werden p50/p95/p99 für den Callback selbst und für die
+# JSON-Serialisierung des Ergebnisses. Die Callback-Zeit wird zusätzlich per
+# cProfile auf Datenfilterung (pandas/numpy), Figurenbau (plotly) und den
+# übrigen Code verteilt.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_callbacks [--repeat 5] [--output ergebnis.json]
+# Die JSON-Ausgabe lässt sich zwischen zwei Läufen vergleichen.
+import argparse
+import cProfile
+import datetime
+import json
+import os
+import platform
+import pstats
+import subprocess
+import sys
+import sysconfig
+import time
+
+import numpy as np
+import pandas as pd
+import plotly
+from plotly.io.json import to_json_plotly
+
+import data_store
+import page_registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Argumente wie von Dash für Callbacks, die mehr als den Schlüsselwert
+# erwarten (Route -> Funktion Schlüsselwert -> Argumente)
+ARGUMENTS = {
+    'monthly_goods_trade': lambda code: ([code], 'Ausfuhr: Wert'),
+}
+
+
+# Sammelt die Callbacks, die ein Modul bei register_callbacks anmeldet
+class RecordingApp:
+    def __init__(self):
+        self.callbacks = []
+
+    def callback(self, *args, **kwargs):
+        def decorator(fn):
+            self.callbacks.append(fn)
+            return fn
+        return decorator
+
+    def clientside_callback(self, *args, **kwargs):
+        pass
+
+
+STDLIB = sysconfig.get_paths()['stdlib'].replace('\\', '/')
+
+
+# Kategorie einer Funktion anhand ihrer Datei; None für Builtins und die
+# Standardbibliothek, deren Zeit dem Aufrufer zugerechnet wird
+def _category(filename):
+    path = filename.replace('\\', '/')
+    if '/pandas/' in path or '/numpy/' in path:
+        return 'data'
+    if '/plotly/' in path or '/_plotly_utils/' in path:
+        return 'figure'
+    if filename.startswith('~') or filename.startswith('<') or (path.startswith(STDLIB) and '-packages/' not in path):
+        return None
+    return 'other'
+
+
+# Verteilt die Eigenzeit aller Funktionen eines Profils auf die Kategorien
+def split_profile(profile):
+    stats = pstats.Stats(profile).stats
+    resolved = {}
+
+    def distribution(func, seen):
+        if func in resolved:
+            return resolved[func]
+        own = _category(func[0])
+        if own is not None:
+            return resolved.setdefault(func, {own: 1.0})
+        weights = {}
+        for caller, (_, _, _, cumtime) in stats.get(func, (0, 0, 0, 0, {}))[4].items():
+            if caller in seen:
+                continue
+            for key, share in distribution(caller, seen | {func}).items():
+                weights[key] = weights.get(key, 0.0) + share * cumtime
+        total = sum(weights.values())
+        result = {key: value / total for key, value in weights.items()} if total else {'other': 1.0}
+        resolved[func] = result
+        return result
+
+    totals = {'data': 0.0, 'figure': 0.0, 'other': 0.0}
+    for func, (_, _, tottime, _, _) in stats.items():
+        for key, share in distribution(func, frozenset()).items():
+            totals[key] += share * tottime
+    total = sum(totals.values()) or 1.0
+    return {key: value / total for key, value in totals.items()}
+
+
+def percentiles(values):
+    if not values:
+        return None
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99, 'n': len(values)}
+
+
+def bench_callback(fn, years, repeat, arguments):
+    callback_ms, serialize_ms, errors = [], [], {}
+    profile = cProfile.Profile()
+    for year in years:
+        args = arguments(year)
+        try:
+            profile.runcall(fn, *args)
+        except Exception as e:
+            errors[str(year)] = repr(e)
+            continue
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = fn(*args)
+            t1 = time.perf_counter()
+            to_json_plotly(result)
+            t2 = time.perf_counter()
+            callback_ms.append((t1 - t0) * 1000)
+            serialize_ms.append((t2 - t1) * 1000)
+
+    shares = split_profile(profile) if callback_ms else None
+    callback = percentiles(callback_ms)
+    return {
+        'years': len(years),
+        'errors': errors,
+        'callback': callback,
+        'serialize': percentiles(serialize_ms),
+        'total': percentiles([a + b for a, b in zip(callback_ms, serialize_ms)]),
+        'callback_split': shares and {f'{key}_ms': share * callback['p50_ms'] for key, share in shares.items()},
+    }
+
+
+def run(repeat):
+    page_registry.discover()
+    results = {}
+    for route in page_registry.routes():
+        page, module = page_registry.get(route)
+        if not hasattr(module, 'register_callbacks'):
+            continue
+        app = RecordingApp()
+        module.register_callbacks(app)
+        key = page.get('key', 'Jahr')
+        values = data_store.get(page['data'][0])[key].unique()
+        years = sorted(int(value) if key == 'Jahr' else str(value) for value in values)
+        arguments = ARGUMENTS.get(route, lambda value: (value,))
+        for i, fn in enumerate(app.callbacks):
+            name = route if len(app.callbacks) == 1 else f'{route}[{i}]'
+            results[name] = bench_callback(getattr(fn, 'uncached', fn), years, repeat, arguments)
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5, help='Aufrufe pro Jahr')
+    parser.add_argument('--output', help='Ergebnis zusätzlich als JSON-Datei schreiben')
+    args = parser.parse_args()
+
+    report = {'meta': metadata(), 'repeat': args.repeat, 'callbacks': run(args.repeat)}
+
+    print(f'{"Callback":<24} {"p50":>7} {"p95":>7} {"p99":>7} {"Daten":>7} {"Figur":>7} {"Sonst":>7} {"JSON":>7}  (ms)')
+    for name, result in report['callbacks'].items():
+        total, split, serialize = result['total'], result['callback_split'], result['serialize']
+        if total is None:
+            print(f'{name:<24} keine erfolgreichen Aufrufe')
+            continue
+        print(f'{name:<24} {total["p50_ms"]:7.2f} {total["p95_ms"]:7.2f} {total["p99_ms"]:7.2f} '
+              f'{split["data_ms"]:7.2f} {split["figure_ms"]:7.2f} {split["other_ms"]:7.2f} '
+              f'{serialize["p50_ms"]:7.2f}')
+        for year, error in result['errors'].items():
+            print(f'{"":<24} Fehler {year}: {error}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# Misst Importzeit und Speicherbedarf (RSS) eines frischen Worker-Prozesses
+# beim Laden aller Graph-Module.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_import [--runs 5]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GRAPH_MODULES = [
+    'gesamt_export_import_volumen', 'monthly_trade', 'top_10_trade_partners', 'top_diff_countries',
+    'top_growth_countries', 'top_diff_goods', 'top_growth_goods', 'top_10_trade_goods'
+]
+
+# Wird in einem eigenen Interpreter ausgeführt, damit jeder Lauf wie ein frischer Worker startet
+CHILD = r'''
+import gc, importlib, json, sys, time
+import dash, pandas, numpy, plotly.graph_objects
+
+def rss_kib():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+
+rss_start = rss_kib()
+import_s = layout_s = 0.0
+for name in sys.argv[1:]:
+    t0 = time.perf_counter()
+    module = importlib.import_module('graphs.' + name)
+    t1 = time.perf_counter()
+    module.create_layout()
+    import_s += t1 - t0
+    layout_s += time.perf_counter() - t1
+
+frames = {id(obj): obj for obj in gc.get_objects() if isinstance(obj, pandas.DataFrame)}
+print(json.dumps({
+    'import_ms': import_s * 1000,
+    'first_layout_ms': layout_s * 1000,
+    'total_ms': (import_s + layout_s) * 1000,
+    'dataframes': len(frames),
+    'dataframes_mib': sum(int(df.memory_usage(deep=True).sum()) for df in frames.values()) / 2**20,
+    'rss_mib': (rss_kib() - rss_start) / 1024,
+}))
+'''
+
+
+def run_once():
+    output = subprocess.check_output([sys.executable, '-c', CHILD] + GRAPH_MODULES, cwd=ROOT)
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    print(f'{len(GRAPH_MODULES)} Graph-Module, Median aus {args.runs} Läufen')
+    for key in runs[0]:
+        print(f'  {key:<18} {statistics.median(run[key] for run in runs):10.1f}')
+
+
+if __name__ == '__main__':
+    main()
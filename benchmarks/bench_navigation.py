@@ -0,0 +1,78 @@
+# Misst die Navigationslatenz pro Route: eine vollständige Anfrage an
+# /_dash-update-component für url.pathname, inklusive Serialisierung.
+# Verglichen wird mit und ohne Layout-Cache (TRADE_LAYOUT_CACHE).
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_navigation [--runs 50]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def navigation_request(route):
+    return {
+        'output': 'page-content.children',
+        'outputs': {'id': 'page-content', 'property': 'children'},
+        'inputs': [{'id': 'url', 'property': 'pathname', 'value': f'/{route}'}],
+        'changedPropIds': ['url.pathname'],
+        'state': [],
+    }
+
+
+# Läuft in einem eigenen Prozess, damit TRADE_LAYOUT_CACHE vor dem Import wirkt
+def measure(runs):
+    import multiple_page_test
+    import page_registry
+
+    client = multiple_page_test.server.test_client()
+    results = {}
+    for route in page_registry.routes():
+        body = navigation_request(route)
+        t0 = time.perf_counter()
+        response = client.post('/_dash-update-component', json=body)
+        first_ms = (time.perf_counter() - t0) * 1000
+        assert response.status_code == 200, (route, response.status_code)
+
+        timings = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            client.post('/_dash-update-component', json=body)
+            timings.append((time.perf_counter() - t0) * 1000)
+        results[route] = {'first_ms': first_ms, 'p50_ms': statistics.median(timings), 'bytes': len(response.data)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.runs)))
+        return
+
+    modes = {}
+    for mode in ['0', '1']:
+        env = dict(os.environ, TRADE_LAYOUT_CACHE=mode)
+        output = subprocess.check_output(
+            [sys.executable, '-m', 'benchmarks.bench_navigation', '--child', '--runs', str(args.runs)],
+            cwd=ROOT, env=env
+        )
+        modes[mode] = json.loads(output)
+
+    print(f'{"Route":<30} {"erste ms":>9} {"ohne Cache p50":>15} {"mit Cache p50":>14} {"Bytes":>8}')
+    for route, uncached in modes['0'].items():
+        cached = modes['1'][route]
+        print(f'{route:<30} {uncached["first_ms"]:9.1f} {uncached["p50_ms"]:15.2f} '
+              f'{cached["p50_ms"]:14.2f} {cached["bytes"]:8}')
+
+
+if __name__ == '__main__':
+    main()
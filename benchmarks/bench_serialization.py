@@ -0,0 +1,70 @@
+# Größe und Kodierzeit der Callback-Ergebnisse vorher/nachher.
+#
+# "vorher": Standard-Template 'plotly' und plotlys JSON-Encoder mit dem
+# Standardmodul json. "nachher": figure_json.dumps mit dem Template 'trade',
+# Float64-Typed-Arrays und orjson. Gemessen wird pro Callback über alle Jahre
+# (Median der Kodierzeit, mittlere Größe in Bytes).
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_serialization [--repeat 5]
+import argparse
+import statistics
+import time
+
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+
+import data_store
+import figure_json
+import page_registry
+from benchmarks.bench_callbacks import RecordingApp
+
+
+def measure(encode, value, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        payload = encode(value)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return len(payload.encode()), statistics.median(timings)
+
+
+def bench(fn, years, repeat):
+    before, after = [], []
+    for year in years:
+        try:
+            pio.templates.default = 'plotly'
+            old = fn(year)
+            pio.templates.default = figure_json.TEMPLATE_NAME
+            new = fn(year)
+        except Exception:
+            continue
+        before.append(measure(lambda value: to_json_plotly(value, engine='json'), old, repeat))
+        after.append(measure(figure_json.dumps, new, repeat))
+    return before, after
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    page_registry.discover()
+    print(f'{"Callback":<24} {"Bytes vorher":>13} {"nachher":>9} {"ms vorher":>10} {"nachher":>9}')
+    for route in page_registry.routes():
+        page, module = page_registry.get(route)
+        if not hasattr(module, 'register_callbacks'):
+            continue
+        app = RecordingApp()
+        module.register_callbacks(app)
+        years = [int(year) for year in sorted(data_store.get(page['data'][0])['Jahr'].unique())]
+        for fn in app.callbacks:
+            before, after = bench(getattr(fn, 'uncached', fn), years, args.repeat)
+            if not before:
+                continue
+            print(f'{route:<24} {statistics.mean(b for b, _ in before):13.0f} {statistics.mean(b for b, _ in after):9.0f} '
+                  f'{statistics.median(t for _, t in before):10.2f} {statistics.median(t for _, t in after):9.2f}')
+
+
+if __name__ == '__main__':
+    main()
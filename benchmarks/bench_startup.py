@@ -0,0 +1,46 @@
+# Vergleicht die Ladezeit aller Datensätze aus CSV mit dem Binär-Cache.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_startup [--runs 20]
+import argparse
+import statistics
+import time
+
+import data_cache
+import data_store
+
+
+def median_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    if not data_cache.ENABLED:
+        parser.error('Binär-Cache ist über TRADE_DATA_CACHE=0 deaktiviert')
+
+    # Cache einmal aufbauen, damit nur das Laden gemessen wird
+    for name in data_store.DATASETS:
+        data_store.load(name)
+
+    print(f'{"Datensatz":<28} {"CSV ms":>9} {"Binär ms":>9} {"Faktor":>7}')
+    total_csv = total_binary = 0.0
+    for name in data_store.DATASETS:
+        csv_ms = median_ms(lambda: data_store.read_csv(name), args.runs)
+        binary_ms = median_ms(lambda: data_store.load(name), args.runs)
+        total_csv += csv_ms
+        total_binary += binary_ms
+        print(f'{name:<28} {csv_ms:9.2f} {binary_ms:9.2f} {csv_ms / binary_ms:6.1f}x')
+    print(f'{"gesamt":<28} {total_csv:9.2f} {total_binary:9.2f} {total_csv / total_binary:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
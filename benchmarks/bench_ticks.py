@@ -0,0 +1,121 @@
+# Vergleich der früheren Tick-Berechnung pro Modul mit axis_ticks.ticks.
+#
+# Für jedes Modul werden die Wertebereiche aller Jahre aus den echten Daten
+# bestimmt und einmal mit der alten Implementierung (np.arange plus
+# Formatierung per Listen-Abstraktion) und einmal mit axis_ticks berechnet,
+# letzteres kalt (leerer Cache) und warm.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.bench_ticks [--repeat 200]
+import argparse
+import math
+import time
+
+import numpy as np
+
+import axis_ticks
+import data_store
+
+
+# Bisherige Implementierungen aus den Graph-Modulen
+def old_monthly_trade(low, high):
+    def formatter(value):
+        if value >= 1e9:
+            return f'{value / 1e9:.0f} Mrd'
+        elif value >= 1e6:
+            return f'{value / 1e6:.0f} Mio'
+        else:
+            return str(value)
+    rounded_max = math.ceil(high / 50e9) * 50e9
+    tickvals = np.arange(0, rounded_max + 1, 25e9)
+    return tickvals, [formatter(val) for val in tickvals]
+
+
+def old_top_10_trade_partners(low, high):
+    def formatter(value):
+        if value >= 1e9:
+            return f'{value / 1e9:.0f} Mrd'
+        elif value >= 1e6:
+            return f'{value / 1e6:.0f} Mio'
+        elif value >= 1e3:
+            return f'{value / 1e3:.0f} K'
+        else:
+            return str(value)
+    rounded_max = math.ceil(high / 50e9) * 50e9
+    tickvals = np.arange(0, rounded_max + 1, 50e9)
+    return tickvals, [formatter(val) for val in tickvals]
+
+
+def old_top_diff_countries(low, high):
+    def formatter(x, pos):
+        return f'{int(x * 1e-9)} Mrd' if abs(x) >= 1e9 else f'{int(x)}'
+    step_size = 1e9
+    min_tick = math.floor(low / step_size) * step_size
+    max_tick = math.ceil(high / step_size) * step_size
+    ticks = np.arange(min_tick, max_tick + step_size, step_size)
+    return ticks, [formatter(val, 0) for val in ticks]
+
+
+def old_top_diff_goods(low, high):
+    def formatter(value):
+        if abs(value) >= 1e9:
+            return f'{int(value * 1e-9)} Mrd'
+        elif abs(value) >= 1e6:
+            return f'{int(value * 1e-6)} Mio'
+        elif abs(value) >= 1e3:
+            return f'{int(value * 1e-3)} Tsd'
+        else:
+            return f'{int(value)}'
+    step_size = 2e9
+    ticks = np.arange(math.floor(low / step_size) * step_size,
+                      math.ceil(high / step_size) * step_size + step_size, step_size)
+    return ticks, [formatter(val) for val in ticks]
+
+
+# Modul -> (alte Funktion, neue Funktion, Wertebereiche aller Jahre)
+def cases():
+    monthly = data_store.get('gesamt_deutschland_monthly')
+    grouped = data_store.get('df_grouped')
+    reduced = data_store.get('df_reduced')
+
+    monthly_max = monthly.groupby('Jahr')[['export_wert', 'import_wert', 'handelsvolumen_wert']].max().max(axis=1)
+    partner_max = grouped.groupby('Jahr')[['export_wert', 'import_wert', 'handelsvolumen_wert']].max().max(axis=1)
+    country_diff = grouped.groupby('Jahr')['export_differenz'].agg(['min', 'max']).dropna()
+    goods = reduced.groupby('Label', observed=True)['Ausfuhr: Wert'].diff().groupby(reduced['Jahr']).agg(['min', 'max']).dropna()
+
+    return {
+        'monthly_trade': (old_monthly_trade, lambda low, high: axis_ticks.ticks(0, high, 25e9, align=50e9),
+                          [(0, high) for high in monthly_max]),
+        'top_10_trade_partners': (old_top_10_trade_partners, lambda low, high: axis_ticks.ticks(0, high, 50e9),
+                                  [(0, high) for high in partner_max]),
+        'top_diff_countries': (old_top_diff_countries, lambda low, high: axis_ticks.ticks(low, high, 1e9),
+                               list(country_diff.itertuples(index=False, name=None))),
+        'top_diff_goods': (old_top_diff_goods, lambda low, high: axis_ticks.ticks(low, high, 2e9),
+                           list(goods.itertuples(index=False, name=None))),
+    }
+
+
+def timed(fn, ranges, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for low, high in ranges:
+            fn(low, high)
+    return (time.perf_counter() - t0) / (repeat * len(ranges)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f'{"Modul":<24} {"Bereiche":>8} {"alt µs":>8} {"kalt µs":>8} {"warm µs":>8}')
+    for name, (old, new, ranges) in cases().items():
+        old_us = timed(old, ranges, args.repeat)
+        axis_ticks._ticks.cache_clear()
+        cold_us = timed(new, ranges, 1)
+        warm_us = timed(new, ranges, args.repeat)
+        print(f'{name:<24} {len(ranges):8} {old_us:8.1f} {cold_us:8.1f} {warm_us:8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# Misst den physischen Speicher (PSS) der Datensätze bei steigender Anzahl
+# Worker, jeweils mit kopierten Frames und mit TRADE_DATA_MMAP=1.
+#
+# PSS verteilt gemeinsam genutzte Seiten anteilig auf die Prozesse, die
+# Summe über alle Worker entspricht daher dem tatsächlichen Verbrauch.
+#
+# Aufruf aus dem Projektverzeichnis (nur Linux):
+#     python -m benchmarks.bench_workers [--workers 1 2 4 8]
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lädt alle Datensätze, berührt jede Spalte einmal und wartet dann auf stdin
+CHILD = r'''
+import sys
+import data_store
+print('importiert', flush=True)
+sys.stdin.readline()
+for name in data_store.NAMES:
+    df = data_store.get(name)
+    for column in df.columns:
+        df[column].to_numpy().sum() if df[column].dtype.kind in 'biuf' else df[column].iloc[-1]
+print('geladen', flush=True)
+sys.stdin.readline()
+'''
+
+
+def pss_kib(pid):
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1])
+
+
+def measure(workers, mmap):
+    env = dict(os.environ, TRADE_DATA_MMAP='1' if mmap else '0')
+    procs = [
+        subprocess.Popen([sys.executable, '-c', CHILD], cwd=ROOT, env=env,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    try:
+        for proc in procs:
+            proc.stdout.readline()
+        before = sum(pss_kib(proc.pid) for proc in procs)
+        for proc in procs:
+            proc.stdin.write('\n')
+            proc.stdin.flush()
+        for proc in procs:
+            proc.stdout.readline()
+        after = sum(pss_kib(proc.pid) for proc in procs)
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    return (after - before) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    # Binär-Cache einmal erzeugen (wie gunicorn.conf.py im Master)
+    subprocess.check_call([sys.executable, '-m', 'data_cache'], cwd=ROOT, stdout=subprocess.DEVNULL)
+
+    print(f'{"Worker":>6} {"Kopie MiB":>10} {"mmap MiB":>10}')
+    for workers in args.workers:
+        print(f'{workers:>6} {measure(workers, mmap=False):10.1f} {measure(workers, mmap=True):10.1f}')
+
+
+if __name__ == '__main__':
+    main()
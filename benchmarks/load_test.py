@@ -0,0 +1,253 @@
+# Lasttest einer gunicorn-Instanz von multiple_page_test:server auf localhost.
+#
+# Für jede Kombination aus Worker- und Thread-Anzahl wird gunicorn auf einem
+# freien lokalen Port gestartet. Danach spielen mehrere virtuelle Nutzer
+# parallel typische Sitzungen gegen /_dash-update-component ab: Seite über
+# url.pathname aufrufen, danach auf den Jahres-Dropdowns der Seite
+# (jahr_dropdown_2, jahr_dropdown_wachstum, ...) mehrere Jahre durchschalten.
+# Die Anfragen werden aus /_dash-dependencies und dem Layout der Seite
+# abgeleitet, neue Seiten werden also automatisch mitgetestet. Dropdowns mit
+# Mehrfachauswahl (multi) bekommen eine Liste von bis zu MAX_SELECTED Werten.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m benchmarks.load_test --workers 1 2 4 --threads 1 4 --users 16 --duration 20
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.bench_navigation import navigation_request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPDATE_PATH = '/_dash-update-component'
+
+# Höchstzahl gleichzeitig gewählter Werte bei Mehrfachauswahl
+MAX_SELECTED = 5
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, threads, port, env):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-w', str(workers), '--threads', str(threads),
+         '-b', f'127.0.0.1:{port}', 'multiple_page_test:server'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn beendet mit Code {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/_dash-dependencies')
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn nicht rechtzeitig erreichbar')
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def request_json(connection, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    headers = {'Content-Type': 'application/json'} if data is not None else {}
+    connection.request(method, path, body=data, headers=headers)
+    response = connection.getresponse()
+    payload = response.read()
+    return response.status, payload
+
+
+# 'a.figure' bzw. '..a.figure...b.figure..' -> [{'id': 'a', 'property': 'figure'}, ...]
+def parse_outputs(output):
+    multi = output.startswith('..')
+    parts = output[2:-2].split('...') if multi else [output]
+    outputs = [dict(zip(['id', 'property'], part.rsplit('.', 1))) for part in parts]
+    return outputs if multi else outputs[0]
+
+
+def update_body(dependency, values):
+    inputs = [dict(item, value=values[item['id']]) for item in dependency['inputs']]
+    return {
+        'output': dependency['output'],
+        'outputs': parse_outputs(dependency['output']),
+        'inputs': inputs,
+        'changedPropIds': [f'{item["id"]}.{item["property"]}' for item in dependency['inputs']],
+        'state': [dict(item, value=values.get(item['id'])) for item in dependency['state']],
+    }
+
+
+# props aller Komponenten im Layout-JSON
+def walk_props(node):
+    if isinstance(node, dict):
+        props = node.get('props')
+        if isinstance(props, dict):
+            yield props
+        for value in node.values():
+            yield from walk_props(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from walk_props(value)
+
+
+# Alle Komponenten mit id: id -> props
+def collect_components(layout):
+    return {props['id']: props for props in walk_props(layout) if isinstance(props.get('id'), str)}
+
+
+# Ziele aller Links der Navigation
+def collect_links(layout):
+    return [props['href'] for props in walk_props(layout)
+            if isinstance(props.get('href'), str) and props['href'].startswith('/')]
+
+
+# Pro Route: Navigationsanfrage und die Callbacks der Seite mit den möglichen
+# Werten ihrer Dropdowns (Input-id -> (Werte, Mehrfachauswahl))
+def build_scenarios(port):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    _, payload = request_json(connection, 'GET', '/_dash-dependencies')
+    dependencies = [d for d in json.loads(payload) if not d.get('clientside_function')]
+
+    _, payload = request_json(connection, 'GET', '/_dash-layout')
+    routes = [href.lstrip('/') for href in collect_links(json.loads(payload))]
+
+    scenarios = {}
+    for route in routes:
+        _, payload = request_json(connection, 'POST', UPDATE_PATH, navigation_request(route))
+        components = collect_components(json.loads(payload))
+        callbacks = []
+        for dependency in dependencies:
+            if not all(item['id'] in components for item in dependency['inputs']):
+                continue
+            options = {}
+            for item in dependency['inputs']:
+                props = components[item['id']]
+                values = [o['value'] if isinstance(o, dict) else o for o in props.get('options', [])]
+                options[item['id']] = (values or [props.get(item['property'])], bool(props.get('multi')))
+            state = {item['id']: components.get(item['id'], {}).get(item['property']) for item in dependency['state']}
+            callbacks.append((dependency, options, state))
+        scenarios[route] = callbacks
+    return scenarios
+
+
+# Zufällige Auswahl wie im Browser: ein Wert oder bei Mehrfachauswahl eine Liste
+def choose(rng, values, multi):
+    if multi:
+        return rng.sample(values, rng.randint(1, min(len(values), MAX_SELECTED)))
+    return rng.choice(values)
+
+
+# Eine Sitzung: Seite aufrufen, danach switches Jahreswechsel pro Callback
+def run_session(connection, rng, scenarios, switches, record):
+    route = rng.choice(list(scenarios))
+    steps = [('navigation', navigation_request(route))]
+    for dependency, options, state in scenarios[route]:
+        for _ in range(switches):
+            values = dict(state, **{key: choose(rng, *option) for key, option in options.items()})
+            steps.append((dependency['output'], update_body(dependency, values)))
+    for name, body in steps:
+        t0 = time.perf_counter()
+        try:
+            status, _ = request_json(connection, 'POST', UPDATE_PATH, body)
+        except (OSError, http.client.HTTPException):
+            status = None
+            connection.close()
+        record(name, (time.perf_counter() - t0) * 1000, status == 200)
+
+
+def run_users(port, scenarios, users, duration, switches, seed):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def record(name, ms, ok):
+        with lock:
+            if ok:
+                latencies.append(ms)
+            else:
+                errors[0] += 1
+
+    def user(index):
+        rng = random.Random(seed + index)
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        while time.monotonic() < stop_at:
+            run_session(connection, rng, scenarios, switches, record)
+        connection.close()
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (float('nan'),) * 3
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'seconds': elapsed,
+        'rps': len(latencies) / elapsed,
+        'p50_ms': p50,
+        'p95_ms': p95,
+        'p99_ms': p99,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--users', type=int, default=16, help='gleichzeitige virtuelle Nutzer')
+    parser.add_argument('--duration', type=float, default=20, help='Messdauer pro Konfiguration in Sekunden')
+    parser.add_argument('--switches', type=int, default=5, help='Jahreswechsel pro Callback und Sitzung')
+    parser.add_argument('--warmup', type=float, default=5, help='ungemessene Aufwärmzeit in Sekunden')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Ergebnis zusätzlich als JSON-Datei schreiben')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    results = []
+    print(f'{"Worker":>6} {"Threads":>7} {"Anfragen":>9} {"Fehler":>7} {"Anfr./s":>8} {"p50":>8} {"p95":>8} {"p99":>8}  (ms)')
+    for workers in args.workers:
+        for threads in args.threads:
+            port = free_port()
+            process = start_server(workers, threads, port, env)
+            try:
+                scenarios = build_scenarios(port)
+                # Aufwärmen, damit jeder Worker seine Daten geladen hat
+                run_users(port, scenarios, args.users, args.warmup, args.switches, args.seed)
+                result = run_users(port, scenarios, args.users, args.duration, args.switches, args.seed)
+            finally:
+                stop_server(process)
+            result.update(workers=workers, threads=threads, users=args.users)
+            results.append(result)
+            print(f'{workers:6} {threads:7} {result["requests"]:9} {result["errors"]:7} {result["rps"]:8.1f} '
+                  f'{result["p50_ms"]:8.1f} {result["p95_ms"]:8.1f} {result["p99_ms"]:8.1f}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# Optionaler Clientside-Modus für Seiten mit kleinen, statischen Jahresdaten.
+#
+# Mit TRADE_CLIENTSIDE=1 werden die Figuren aller Jahre einmal mit dem Layout
+# an den Browser geschickt und der Jahreswechsel läuft als Dash-Clientside-
+# Callback (assets/clientside.js) ganz ohne Serveranfrage. Ohne die Variable
+# bleiben die normalen Python-Callbacks aktiv.
+#
+# Damit die Nutzlast klein bleibt, wird pro Figur nur eine Basisfigur
+# (inklusive Template) übertragen; pro Jahr folgen nur die Trace- und
+# Layout-Einträge, die sich von der Basis unterscheiden.
+#
+# Hat ein Callback mehrere Eingaben (z. B. Jahr und Granularität), sind die
+# Schlüssel Tupel aller Eingabewerte; im Browser werden sie als 'Wert|Wert'
+# nachgeschlagen.
+import os
+
+from dash import ClientsideFunction, dcc
+from dash.dependencies import State
+
+import data_store
+import figure_json
+
+ENABLED = os.environ.get('TRADE_CLIENTSIDE') == '1'
+
+# Name -> Callback-Funktion, aus der die Nutzlast berechnet wird
+_callbacks = {}
+
+
+def _store_id(name):
+    return f'{name}_clientside_data'
+
+
+# Einträge, die von base abweichen; fehlende Einträge werden mit None gelöscht
+def _diff(value, base):
+    diff = {key: item for key, item in value.items() if base.get(key) != item}
+    diff.update({key: None for key in base if key not in value})
+    return diff
+
+
+# Schlüssel im Store: '2024' bzw. '2024|quarter'
+def _key(key):
+    return '|'.join(str(part) for part in key) if isinstance(key, tuple) else str(key)
+
+
+def build_payload(fn, years):
+    figures_by_year = {}
+    multi = False
+    for year in years:
+        result = figure_json.loads(figure_json.dumps(fn(*year) if isinstance(year, tuple) else fn(year)))
+        multi = isinstance(result, list)
+        figures_by_year[year] = result if multi else [result]
+
+    base = figures_by_year[years[0]]
+    payload = {'multi': multi, 'base': base, 'years': {}}
+    for year, figures in figures_by_year.items():
+        payload['years'][_key(year)] = [
+            {
+                'data': [_diff(trace, base_figure['data'][i] if i < len(base_figure['data']) else {})
+                         for i, trace in enumerate(figure['data'])],
+                'layout': _diff(figure['layout'], base_figure['layout']),
+            }
+            for figure, base_figure in zip(figures, base)
+        ]
+    return payload
+
+
+# Ersetzt app.callback für eine Jahres-Callback-Funktion. Im Clientside-Modus
+# wird stattdessen ein Clientside-Callback registriert, der die Figuren aus
+# dem Store von store(name, years) liest. year_input kann auch eine Liste von
+# Eingaben sein (siehe oben).
+def callback(app, name, outputs, year_input):
+    def decorator(fn):
+        _callbacks[name] = fn
+        if not ENABLED:
+            return app.callback(outputs, year_input)(fn)
+        inputs = year_input if isinstance(year_input, list) else [year_input]
+        app.clientside_callback(
+            ClientsideFunction(namespace='trade', function_name='figures'),
+            outputs,
+            inputs + [State(_store_id(name), 'data')]
+        )
+        return fn
+    return decorator
+
+
+# Store mit den Jahresfiguren (leer, wenn der Clientside-Modus aus ist)
+def store(name, years):
+    if not ENABLED:
+        return dcc.Store(id=_store_id(name))
+    years = [tuple(year) if isinstance(year, tuple) else int(year) for year in years]
+    payload = data_store.cached(('clientside', name), lambda: build_payload(_callbacks[name], years))
+    return dcc.Store(id=_store_id(name), data=payload)
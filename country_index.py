@@ -0,0 +1,133 @@
+# Indizes über die Länderdaten (df_grouped).
+#
+# CountryIndex partitioniert die Tabelle einmal nach Jahr und sortiert jede
+# Partition für alle Kennzahlen vor. Top-N-, Bottom-N- und Rang-Abfragen sind
+# danach nur noch Slices der vorsortierten Positionen, ohne Maske über alle
+# Zeilen.
+#
+# CountrySeries legt die Zeitreihe jedes Landes als zusammenhängenden, nach
+# Jahr sortierten Bereich in Spalten-Arrays ab. Die Reihe eines Landes ist
+# ein Dictionary-Zugriff plus Slices.
+import numpy as np
+
+import data_store
+import metrics
+
+# Einträge in df_grouped, die keine Länder sind
+NON_COUNTRIES = ['Nicht ermittelte Länder und Gebiete', 'Schiffs- und Luftfahrzeugbedarf']
+
+METRICS = [
+    'export_wert', 'import_wert', 'handelsvolumen_wert',
+    'export_ranking', 'import_ranking', 'handelsvolumen_ranking',
+    'export_wachstum', 'import_wachstum', 'handelsvolumen_wachstum',
+    'export_wachstum_ranking', 'import_wachstum_ranking', 'handelsvolumen_wachstum_ranking',
+    'export_differenz', 'import_differenz', 'handelsvolumen_differenz',
+]
+
+
+class CountryIndex:
+    def __init__(self, df, metrics=METRICS):
+        # Stabil nach Jahr sortieren, damit die Reihenfolge innerhalb eines
+        # Jahres (und damit die Auflösung von Gleichständen) erhalten bleibt
+        self.frame = df.sort_values('Jahr', kind='stable', ignore_index=True)
+        self.years = [int(year) for year in self.frame['Jahr'].unique()]
+        self._countries = self.frame['Land'].cat.categories
+        self._country_codes = self.frame['Land'].cat.codes.to_numpy()
+
+        year_values = self.frame['Jahr'].to_numpy()
+        starts = np.searchsorted(year_values, self.years, side='left')
+        stops = np.searchsorted(year_values, self.years, side='right')
+        bounds = dict(zip(self.years, zip(starts, stops)))
+
+        # (Kennzahl, Jahr) -> (Positionen aufsteigend, Positionen absteigend, sortierte Werte)
+        # Fehlende Werte (NaN) werden wie bei nlargest/nsmallest ausgelassen.
+        self._orders = {}
+        self._values = {}
+        for metric in metrics:
+            values = self._values[metric] = self.frame[metric].to_numpy(dtype=float)
+            for year, (start, stop) in bounds.items():
+                part = values[start:stop]
+                valid = np.flatnonzero(~np.isnan(part))
+                ascending = valid[np.argsort(part[valid], kind='stable')]
+                descending = valid[np.argsort(-part[valid], kind='stable')]
+                self._orders[metric, year] = (ascending + start, descending + start, part[ascending])
+
+    def _positions(self, year, metric):
+        return self._orders.get((metric, int(year)), (np.empty(0, dtype=np.intp),) * 3)
+
+    def _first(self, positions, n, exclude):
+        if exclude:
+            positions = positions[:n + len(exclude)]
+            excluded = self._countries.get_indexer(exclude)
+            positions = positions[~np.isin(self._country_codes[positions], excluded)]
+        positions = positions[:n]
+        metrics.count_rows(len(positions))
+        return positions
+
+    def _take(self, positions, n, exclude):
+        return self.frame.iloc[self._first(positions, n, exclude)]
+
+    # Die n Länder mit den größten Werten (wie DataFrame.nlargest)
+    def top_n(self, year, metric, n, exclude=()):
+        return self._take(self._positions(year, metric)[1], n, exclude)
+
+    # Die n Länder mit den kleinsten Werten (wie DataFrame.nsmallest)
+    def bottom_n(self, year, metric, n, exclude=()):
+        return self._take(self._positions(year, metric)[0], n, exclude)
+
+    # Top-n und Bottom-n als Arrays (Länder, Werte) ohne DataFrame-Zwischenschritt:
+    # (Länder oben, Werte oben, Länder unten, Werte unten)
+    def top_bottom(self, year, metric, n, exclude=()):
+        ascending, descending, _ = self._positions(year, metric)
+        values = self._values[metric]
+        result = []
+        for positions in [self._first(descending, n, exclude), self._first(ascending, n, exclude)]:
+            result += [np.asarray(self._countries[self._country_codes[positions]]), values[positions]]
+        return tuple(result)
+
+    # Alle Länder mit Rang <= n, nach Rang sortiert
+    def rank_le(self, year, ranking, n):
+        ascending, _, values = self._positions(year, ranking)
+        positions = ascending[:np.searchsorted(values, n, side='right')]
+        metrics.count_rows(len(positions))
+        return self.frame.iloc[positions]
+
+
+# Spalten, die CountrySeries pro Land bereithält
+SERIES_COLUMNS = [
+    'export_wert', 'import_wert', 'handelsvolumen_wert', 'handelsbilanz',
+    'export_ranking', 'import_ranking', 'handelsvolumen_ranking',
+]
+
+
+class CountrySeries:
+    def __init__(self, df, columns=SERIES_COLUMNS):
+        frame = df.sort_values(['Land', 'Jahr'], kind='stable', ignore_index=True)
+        codes = frame['Land'].cat.codes.to_numpy()
+        present = np.unique(codes)
+        starts = np.searchsorted(codes, present, side='left')
+        stops = np.searchsorted(codes, present, side='right')
+
+        # Länder in der Reihenfolge der Kategorien (alphabetisch)
+        self.countries = [str(country) for country in frame['Land'].cat.categories[present]]
+        self._bounds = dict(zip(self.countries, zip(starts, stops)))
+        self._columns = {column: frame[column].to_numpy() for column in ['Jahr'] + list(columns)}
+
+    def __contains__(self, country):
+        return country in self._bounds
+
+    # Spalte -> Werte des Landes (Slices ohne Kopie), nach Jahr sortiert
+    def series(self, country):
+        start, stop = self._bounds[country]
+        metrics.count_rows(stop - start)
+        return {column: values[start:stop] for column, values in self._columns.items()}
+
+
+# Index über alle Zeilen von df_grouped (einmal pro Datenstand aufgebaut)
+def get():
+    return data_store.cached('country_index', lambda: CountryIndex(data_store.get('df_grouped')))
+
+
+# Zeitreihen aller Länder aus df_grouped (einmal pro Datenstand aufgebaut)
+def get_series():
+    return data_store.cached('country_series', lambda: CountrySeries(data_store.get('df_grouped')))
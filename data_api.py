@@ -0,0 +1,46 @@
+# HTTP-Zugriff auf Jahresausschnitte der Datensätze.
+#
+# Die Seiten schicken keine kompletten Tabellen mehr an den Browser, sondern
+# nur einen Schlüssel (Datensatz + Datenstand). Wer im Browser Daten braucht,
+# holt sich damit gezielt ein Jahr:
+#     GET /api/data/<datensatz>/<jahr>
+import flask
+import numpy as np
+
+import data_store
+
+
+# Kleiner Verweis auf einen Datensatz, z. B. als Inhalt eines dcc.Store
+def dataset_key(name):
+    return {'dataset': name, 'version': data_store.data_version()}
+
+
+# Spaltenwerte als Liste; NaN und ±inf (z. B. Wachstum gegenüber 0) werden
+# zu None (JSON null), da strenge JSON-Parser wie fetch().json() sie ablehnen
+def _column_values(column):
+    if column.dtype.kind != 'f':
+        return column.tolist()
+    return column.astype(object).where(np.isfinite(column), None).tolist()
+
+
+# Zeilen eines Jahres spaltenweise als JSON-fähiges dict
+def year_data(name, year):
+    frame = data_store.get(name)
+    if frame['Jahr'].is_monotonic_increasing:
+        rows = data_store.year_slice(frame, year)
+    else:
+        rows = frame[frame['Jahr'] == year]
+    return {
+        'dataset': name,
+        'version': data_store.data_version(),
+        'Jahr': year,
+        'columns': {column: _column_values(rows[column]) for column in rows.columns},
+    }
+
+
+def register_routes(server):
+    @server.route('/api/data/<name>/<int:year>')
+    def api_year_data(name, year):
+        if name not in data_store.NAMES:
+            flask.abort(404)
+        return flask.jsonify(year_data(name, year))
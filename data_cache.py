@@ -0,0 +1,148 @@
+# Binärer Cache für die CSV-Dateien in data/.
+#
+# Jede CSV wird einmal in ein Verzeichnis mit einer .npy-Datei pro Spalte
+# übersetzt (kategorische Spalten als Codes + Kategorien). Spätere Starts
+# laden nur noch diese Arrays statt den Text erneut zu parsen. Der Cache ist
+# an Größe, Änderungszeit und SHA-1 der Quelldatei gebunden und baut sich
+# selbst neu, sobald sich die CSV ändert.
+#
+# Cache für alle Datensätze vorab erzeugen:
+#     python -m data_cache
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', '.cache')
+
+# Mit TRADE_DATA_CACHE=0 wird immer direkt aus der CSV gelesen
+ENABLED = os.environ.get('TRADE_DATA_CACHE', '1') != '0'
+
+FORMAT_VERSION = 1
+
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    tmp_path = f'{path}.tmp-{os.getpid()}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+# Schreibt einen DataFrame spaltenweise als .npy-Dateien nach target_dir.
+# Es wird zuerst in ein temporäres Verzeichnis geschrieben, damit parallel
+# startende Worker nie ein halb geschriebenes Cache-Verzeichnis sehen.
+def write_frame(df, target_dir):
+    tmp_dir = f'{target_dir}.tmp-{os.getpid()}'
+    os.makedirs(tmp_dir, exist_ok=True)
+    columns = []
+    for i, (name, series) in enumerate(df.items()):
+        column = {'name': name, 'dtype': str(series.dtype), 'file': f'c{i}.npy'}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            column['categories'] = f'c{i}_categories.npy'
+            np.save(os.path.join(tmp_dir, column['file']), series.cat.codes.to_numpy())
+            np.save(os.path.join(tmp_dir, column['categories']), series.cat.categories.to_numpy(dtype=str))
+        elif series.dtype.kind in 'biuf':
+            np.save(os.path.join(tmp_dir, column['file']), series.to_numpy())
+        else:
+            np.save(os.path.join(tmp_dir, column['file']), series.to_numpy(dtype=str))
+        columns.append(column)
+    _write_json(os.path.join(tmp_dir, 'columns.json'), {'format': FORMAT_VERSION, 'columns': columns})
+    try:
+        os.rename(tmp_dir, target_dir)
+    except OSError:
+        # Ein anderer Prozess war schneller – dessen Ergebnis ist identisch
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def read_frame(source_dir, mmap_mode=None):
+    meta = _read_json(os.path.join(source_dir, 'columns.json'))
+    if meta is None or meta.get('format') != FORMAT_VERSION:
+        raise FileNotFoundError(source_dir)
+    data = {}
+    for column in meta['columns']:
+        values = np.load(os.path.join(source_dir, column['file']), mmap_mode=mmap_mode)
+        if 'categories' in column:
+            categories = np.load(os.path.join(source_dir, column['categories']))
+            data[column['name']] = pd.Categorical.from_codes(values, categories=pd.Index(categories))
+        elif values.dtype.kind == 'U':
+            data[column['name']] = pd.Series(values).astype(column['dtype'])
+        else:
+            data[column['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+# Lädt eine CSV über den Binär-Cache. read_csv erzeugt den DataFrame aus der
+# Quelldatei, falls der Cache fehlt oder veraltet ist. Mit mmap_mode='r'
+# werden die numerischen Spalten schreibgeschützt eingeblendet statt gelesen.
+#
+# Für abgeleitete Tabellen wird ein eigener name vergeben; version wird mit
+# in den Schlüssel aufgenommen, damit geänderte Berechnungen den Cache ersetzen.
+def load(csv_path, read_csv, mmap_mode=None, name=None, version=''):
+    if not ENABLED:
+        return read_csv(csv_path)
+
+    name = name or os.path.splitext(os.path.basename(csv_path))[0]
+    pointer_path = os.path.join(CACHE_DIR, f'{name}.json')
+    stat = os.stat(csv_path)
+    pointer = _read_json(pointer_path)
+
+    if (pointer and pointer['size'] == stat.st_size and pointer['mtime_ns'] == stat.st_mtime_ns
+            and pointer.get('version', '') == str(version)):
+        try:
+            return read_frame(os.path.join(CACHE_DIR, pointer['dir']), mmap_mode)
+        except (OSError, ValueError):
+            pass
+
+    sha1 = file_sha1(csv_path)
+    if version:
+        sha1 = hashlib.sha1(f'{sha1}:{version}'.encode()).hexdigest()
+    cache_name = f'{name}-{sha1[:16]}'
+    cache_path = os.path.join(CACHE_DIR, cache_name)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        if not os.path.isdir(cache_path):
+            write_frame(read_csv(csv_path), cache_path)
+            _remove_stale(name, keep=cache_name)
+        _write_json(pointer_path, {
+            'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'version': str(version),
+            'sha1': sha1, 'dir': cache_name
+        })
+        return read_frame(cache_path, mmap_mode)
+    except OSError as e:
+        # z. B. schreibgeschütztes Datenverzeichnis: ohne Cache weiterarbeiten
+        print(f'Binär-Cache für {name} nicht nutzbar ({e}), lese CSV.', file=sys.stderr)
+        return read_csv(csv_path)
+
+
+def _remove_stale(name, keep):
+    for entry in os.listdir(CACHE_DIR):
+        if entry.startswith(f'{name}-') and entry != keep and '.tmp-' not in entry:
+            shutil.rmtree(os.path.join(CACHE_DIR, entry), ignore_errors=True)
+
+
+if __name__ == '__main__':
+    import data_store
+
+    for dataset in data_store.NAMES:
+        df = data_store.load(dataset)
+        print(f'{dataset}: {len(df)} Zeilen, {len(df.columns)} Spalten')
@@ -0,0 +1,317 @@
+# Zentraler Datenzugriff für alle Graph-Module.
+#
+# Jeder Datensatz aus data/ wird pro Prozess genau einmal (beim ersten Zugriff)
+# eingelesen und danach von allen Modulen gemeinsam genutzt. Die Spaltentypen
+# sind bewusst kompakt gewählt (Kategorien für Texte, kleine Integer für Jahr
+# und Monat), damit ein Worker möglichst wenig Speicher belegt.
+#
+# Alle Frames und daraus abgeleiteten Objekte eines Datenstands liegen in
+# einem Snapshot. Ein Hintergrund-Thread (start_watcher) prüft data/ auf
+# Änderungen, lädt einen neuen Snapshot abseits der Anfragen vollständig und
+# tauscht ihn dann in einem Schritt aus. Jede Anfrage hält den Snapshot fest,
+# mit dem sie begonnen hat (register), und sieht daher nie eine Mischung aus
+# altem und neuem Datenstand.
+import contextlib
+import contextvars
+import hashlib
+import os
+import sys
+import threading
+import time
+
+import flask
+import numpy as np
+import pandas as pd
+
+import data_cache
+import metrics
+import pipeline
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Mit TRADE_DATA_MMAP=1 werden die numerischen Spalten aus dem Binär-Cache nur
+# schreibgeschützt eingeblendet statt kopiert. Alle Worker teilen sich dann
+# dieselben Seiten im Page-Cache, der Speicherbedarf wächst kaum mit der
+# Anzahl der Worker.
+MMAP = os.environ.get('TRADE_DATA_MMAP') == '1'
+
+# Wie oft (in Sekunden) die Dateien in data/ höchstens auf Änderungen geprüft werden
+VERSION_TTL = 1.0
+
+# Prüfintervall des Hintergrund-Threads in Sekunden (TRADE_DATA_WATCH=0 schaltet
+# ihn ab; dann wird nach einer Änderung beim nächsten Zugriff neu geladen)
+WATCH_INTERVAL = float(os.environ.get('TRADE_DATA_WATCH', '2'))
+
+_WERTE = {'export_wert': 'int64', 'import_wert': 'int64', 'handelsvolumen_wert': 'int64'}
+
+# Datensatzname -> (Dateiname, Spaltentypen)
+DATASETS = {
+    'df_grouped': ('df_grouped.csv', {
+        'Land': 'category',
+        'Jahr': 'int16',
+        **_WERTE,
+        'handelsbilanz': 'int64',
+        'handelsbilanz_status': 'category',
+        'export_ranking': 'float32',
+        'import_ranking': 'float32',
+        'handelsvolumen_ranking': 'float32',
+        'export_wachstum_ranking': 'float32',
+        'import_wachstum_ranking': 'float32',
+        'handelsvolumen_wachstum_ranking': 'float32',
+    }),
+    'aggregated_df': ('aggregated_df.csv', {
+        'Jahr': 'int16',
+        'Monat': 'int8',
+        'Code': 'category',
+        'Label': 'category',
+        'Ausfuhr: Wert': 'int64',
+        'Einfuhr: Wert': 'int64',
+        'Handelsvolumen': 'int64',
+    }),
+    'gesamt_deutschland_monthly': ('gesamt_deutschland_monthly.csv', {
+        'Jahr': 'int16',
+        'Monat': 'int8',
+        **_WERTE,
+    }),
+    '1gesamt_deutschland': ('1gesamt_deutschland.csv', {
+        'Jahr': 'int16',
+        'gesamt_export': 'int64',
+        'gesamt_import': 'int64',
+        'gesamt_handelsvolumen': 'int64',
+    }),
+}
+
+# Abgeleitete Datensätze: Name -> (Quelldatensatz, Funktion aus pipeline.py).
+# df_reduced wird aus denselben Jahressummen erzeugt wie goods_yearly, damit
+# die beiden Warentabellen nicht auseinanderlaufen können.
+DERIVED = {
+    'goods_yearly': ('aggregated_df', pipeline.goods_yearly),
+    'df_reduced': ('goods_yearly', pipeline.reduced),
+    'goods_yoy': ('df_reduced', pipeline.goods_yoy),
+}
+
+NAMES = list(DATASETS) + list(DERIVED)
+
+
+
+# Datenstand: Kennung plus alle daraus geladenen Frames und Objekte. Ein
+# Snapshot wird nur befüllt, nie geleert; ein neuer Datenstand ersetzt ihn.
+class Snapshot:
+    def __init__(self, version):
+        self.version = version
+        self.frames = {}
+        self.lock = threading.RLock()
+
+
+_current = Snapshot(None)
+# Von der laufenden Anfrage festgehaltener Snapshot (siehe pinned/register)
+_pinned = contextvars.ContextVar('trade_data_snapshot', default=None)
+_lock = threading.Lock()
+_version = None
+_version_checked = float('-inf')
+# Schlüssel -> build() aller bisher angefragten Objekte, zum Vorladen in reload()
+_builders = {}
+# Funktionen, die nach jedem Wechsel des Snapshots aufgerufen werden
+_listeners = []
+_watcher_pid = None
+_on_reload = None
+
+
+def _file_version():
+    parts = []
+    for filename, _ in DATASETS.values():
+        stat = os.stat(os.path.join(DATA_DIR, filename))
+        parts.append(f'{filename}:{stat.st_size}:{stat.st_mtime_ns}')
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:16]
+
+
+# Kennung des aktuellen Datenstands. Ändert sich, sobald eine Datei in data/
+# geändert wird, und dient Caches (z. B. figure_cache) als Schlüssel.
+# Innerhalb einer Anfrage die Kennung ihres Snapshots; läuft der
+# Hintergrund-Thread, die des zuletzt eingetauschten Snapshots.
+def data_version():
+    global _version, _version_checked
+    snapshot = _pinned.get()
+    if snapshot is not None:
+        return snapshot.version
+    if _watcher_pid == os.getpid():
+        return _current.version
+    now = time.monotonic()
+    if now - _version_checked >= VERSION_TTL:
+        _version = _file_version()
+        _version_checked = now
+    return _version
+
+
+def read_csv(name):
+    filename, dtypes = DATASETS[name]
+    return pd.read_csv(os.path.join(DATA_DIR, filename), dtype=dtypes)
+
+
+def _source_file(name):
+    while name in DERIVED:
+        name = DERIVED[name][0]
+    return os.path.join(DATA_DIR, DATASETS[name][0])
+
+
+# Lädt einen Datensatz über den Binär-Cache (siehe data_cache.py). Abgeleitete
+# Datensätze werden dabei nur neu berechnet, wenn sich ihre Quelldatei ändert.
+def load(name, mmap=MMAP):
+    mmap_mode = 'r' if mmap else None
+    if name in DERIVED:
+        source, build = DERIVED[name]
+        return data_cache.load(
+            _source_file(name),
+            lambda path: build(load(source, mmap=False)),
+            mmap_mode=mmap_mode,
+            name=name,
+            version=pipeline.VERSION
+        )
+    filename, dtypes = DATASETS[name]
+    return data_cache.load(
+        os.path.join(DATA_DIR, filename),
+        lambda path: pd.read_csv(path, dtype=dtypes),
+        mmap_mode=mmap_mode
+    )
+
+
+# Zeilen eines nach Jahr sortierten Datensatzes für ein Jahr. Binäre Suche
+# auf der Jahr-Spalte statt einer Maske über die ganze Tabelle. Die Zeilen
+# des Jahres werden dem laufenden Callback zugerechnet (siehe metrics.py).
+def year_slice(frame, year):
+    start, stop = np.searchsorted(frame['Jahr'].to_numpy(), [year, year + 1])
+    metrics.count_rows(stop - start)
+    return frame.iloc[start:stop]
+
+
+def _swap(snapshot):
+    global _current
+    _current = snapshot
+    for listener in _listeners:
+        listener()
+
+
+# Snapshot für den aktuellen Zugriff. Ohne Hintergrund-Thread wird ein neuer
+# (leerer) Snapshot angelegt, sobald sich die Dateien geändert haben.
+def _snapshot():
+    snapshot = _pinned.get()
+    if snapshot is not None:
+        return snapshot
+    version = data_version()
+    if _current.version != version:
+        with _lock:
+            if _current.version != version:
+                _swap(Snapshot(version))
+    return _current
+
+
+def _cached(key, build):
+    _builders.setdefault(key, build)
+    snapshot = _snapshot()
+    value = snapshot.frames.get(key)
+    if value is None:
+        with snapshot.lock:
+            value = snapshot.frames.get(key)
+            if value is None:
+                # Verschachtelte Zugriffe in build() nutzen denselben Snapshot
+                token = _pinned.set(snapshot)
+                try:
+                    value = snapshot.frames[key] = build()
+                finally:
+                    _pinned.reset(token)
+    return value
+
+
+# Liefert den (gemeinsam genutzten) DataFrame eines Datensatzes.
+# Die Frames dürfen von den Aufrufern nicht verändert werden.
+# Nach einer Änderung in data/ kommen die Frames aus dem neuen Snapshot (siehe reload).
+def get(name):
+    return _cached(name, lambda: load(name))
+
+
+# Wie get(), aber für beliebige aus den Datensätzen berechnete Objekte
+# (z. B. Indizes). build() wird einmal pro Datenstand aufgerufen.
+def cached(key, build):
+    return _cached(('cached', key), build)
+
+
+# Registriert eine Funktion, die nach jedem Wechsel des Datenstands aufgerufen
+# wird (z. B. um Caches zu leeren)
+def on_swap(listener):
+    _listeners.append(listener)
+
+
+# Hält den aktuellen Snapshot für die Dauer des with-Blocks fest
+@contextlib.contextmanager
+def pinned():
+    token = _pinned.set(_snapshot())
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+# Lädt den Stand von data/ in einen neuen Snapshot, mit allen Datensätzen und
+# Objekten, die bisher angefragt wurden, und tauscht ihn danach in einem
+# Schritt ein. Ändern sich die Dateien während des Ladens erneut (z. B. mitten
+# in einem Schreibvorgang), wird der Snapshot verworfen und beim nächsten
+# Aufruf neu versucht. Gibt True zurück, wenn getauscht wurde.
+def reload():
+    version = _file_version()
+    if version == _current.version:
+        return False
+    snapshot = Snapshot(version)
+    token = _pinned.set(snapshot)
+    try:
+        for key, build in list(_builders.items()):
+            _cached(key, build)
+    finally:
+        _pinned.reset(token)
+    if _file_version() != version:
+        return False
+    with _lock:
+        _swap(snapshot)
+    return True
+
+
+def _watch(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            if reload() and _on_reload is not None:
+                _on_reload()
+        except Exception as e:
+            print(f'Neuladen von {DATA_DIR} fehlgeschlagen: {e!r}', file=sys.stderr)
+
+
+# Startet den Hintergrund-Thread, der data/ alle interval Sekunden prüft und
+# geänderte Daten per reload() eintauscht. on_reload wird danach im selben
+# Thread aufgerufen (z. B. zum Vorberechnen) und für spätere Aufrufe ohne
+# on_reload gemerkt. Läuft einmal pro Prozess, nach einem fork erneut.
+def start_watcher(interval=WATCH_INTERVAL, on_reload=None):
+    global _watcher_pid, _on_reload
+    if on_reload is not None:
+        _on_reload = on_reload
+    with _lock:
+        if interval <= 0 or _watcher_pid == os.getpid():
+            return
+        if _current.version is None:
+            _swap(Snapshot(_file_version()))
+        _watcher_pid = os.getpid()
+    threading.Thread(target=_watch, args=(interval,), name='data-watcher', daemon=True).start()
+
+
+# Jede Anfrage an server hält ihren Snapshot bis zum Ende fest; startet den
+# Hintergrund-Thread
+def register(server, on_reload=None):
+    @server.before_request
+    def pin_snapshot():
+        flask.g.trade_snapshot = _pinned.set(_snapshot())
+
+    @server.teardown_request
+    def release_snapshot(exc):
+        token = flask.g.pop('trade_snapshot', None)
+        if token is not None:
+            _pinned.reset(token)
+
+    start_watcher(on_reload=on_reload)
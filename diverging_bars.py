@@ -0,0 +1,76 @@
+# Gemeinsame Figuren für die Top-/Bottom-N-Seiten (Differenzen und Wachstum).
+#
+# Die Seiten zeigen pro Kennzahl ein horizontales Balkendiagramm mit den n
+# größten (grün) und den n kleinsten Werten (rot). select() bestimmt diese für
+# alle Kennzahlen einer Tabelle in einem Durchgang, mit einer Partition pro
+# Spalte statt nlargest/nsmallest. DivergingBars baut die Figuren direkt als
+# dict aus einer einmal erzeugten Basis (Template, Trace-Stil, Achsentitel);
+# die Validierung der plotly-graph_objects entfällt damit bei jedem Aufruf.
+import numpy as np
+
+import figure_json
+
+EMPTY = np.empty(0, dtype=np.intp)
+
+
+# Positionen der k kleinsten Schlüssel, aufsteigend; Gleichstände nach
+# Position wie bei nsmallest(keep='first')
+def _first_k(keys, k):
+    if k <= 0:
+        return EMPTY
+    if k < len(keys):
+        threshold = np.partition(keys, k - 1)[k - 1]
+        candidates = np.flatnonzero(keys <= threshold)
+    else:
+        candidates = np.arange(len(keys))
+    order = np.lexsort((candidates, keys[candidates]))
+    return candidates[order[:k]]
+
+
+# Für jede Spalte von values (Zeilen x Kennzahlen): (Positionen der n größten
+# Werte absteigend, Positionen der n kleinsten aufsteigend). Fehlende Werte
+# (NaN) werden wie bei nlargest/nsmallest ausgelassen.
+def select(values, n):
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    result = []
+    for column in values.T:
+        valid = np.flatnonzero(~np.isnan(column))
+        part = column[valid]
+        k = min(n, len(part))
+        result.append((valid[_first_k(-part, k)], valid[_first_k(part, k)]))
+    return result
+
+
+# (min(kleinster Wert, 0), max(größter Wert, 0)); NaN, wenn keine Werte da sind
+def value_range(top_values, bottom_values):
+    low = bottom_values.min() if len(bottom_values) else np.nan
+    high = top_values.max() if len(top_values) else np.nan
+    return float(min(low, 0)), float(max(high, 0))
+
+
+class DivergingBars:
+    def __init__(self, top_name, bottom_name, top_hover, bottom_hover, layout=None):
+        self._traces = [
+            {'type': 'bar', 'orientation': 'h', 'name': name, 'marker': {'color': color}, 'hovertemplate': hover}
+            for name, color, hover in [(top_name, 'green', top_hover), (bottom_name, 'red', bottom_hover)]
+        ]
+        self._layout = dict(layout or {}, template=figure_json.TEMPLATE)
+
+    # Figur als dict; xaxis ergänzt die Achsenangaben der Basis (z. B. range, Ticks)
+    def figure(self, top_labels, top_values, bottom_labels, bottom_values, title, xaxis=None, **layout):
+        top, bottom = self._traces
+        figure_layout = dict(self._layout, title={'text': title}, **layout)
+        if xaxis:
+            xaxis = dict(xaxis)
+            if 'tickvals' in xaxis:
+                xaxis['tickvals'] = figure_json.typed_array(xaxis['tickvals'])
+            figure_layout['xaxis'] = dict(self._layout.get('xaxis', {}), **xaxis)
+        return {
+            'data': [
+                dict(top, y=figure_json.typed_array(top_labels), x=figure_json.typed_array(top_values)),
+                dict(bottom, y=figure_json.typed_array(bottom_labels), x=figure_json.typed_array(bottom_values)),
+            ],
+            'layout': figure_layout,
+        }
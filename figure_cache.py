@@ -0,0 +1,106 @@
+# Cache für die Figuren der Jahres-Callbacks.
+#
+# Die Daten sind statisch und es gibt nur wenige Jahre, daher wird das
+# Ergebnis eines Callbacks pro (Modul, Jahr) einmal als JSON serialisiert und
+# danach direkt ausgeliefert, ohne pandas oder plotly erneut zu bemühen.
+# Der Cache ist in der Größe begrenzt (LRU) und wird im selben Moment
+# verworfen, in dem data_store einen neuen Datenstand eintauscht.
+#
+# Umgebungsvariablen:
+#     TRADE_FIGURE_CACHE_SIZE    maximale Anzahl Einträge (0 schaltet den Cache ab)
+#     TRADE_FIGURE_CACHE_WARMUP  1 = alle Jahre beim Start vorberechnen
+import collections
+import functools
+import inspect
+import itertools
+import os
+import sys
+import threading
+
+import data_store
+import figure_json
+
+MAX_SIZE = int(os.environ.get('TRADE_FIGURE_CACHE_SIZE', '256'))
+WARMUP = os.environ.get('TRADE_FIGURE_CACHE_WARMUP') == '1'
+
+_entries = collections.OrderedDict()
+_lock = threading.Lock()
+
+# Name -> (Callback-Funktion, Signatur, Datensatz, Spalte mit den
+# Argumentwerten, weitere Argumente); nur Callbacks, die warm_up() vorberechnet
+_registry = {}
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+# Einträge sind an den Datenstand gebunden; eine Anfrage, die noch mit dem
+# alten Snapshot läuft, kann damit keine veraltete Figur für den neuen ablegen
+def _lookup(key, fn, args):
+    key = (data_store.data_version(),) + key
+    with _lock:
+        payload = _entries.get(key)
+        if payload is not None:
+            _entries.move_to_end(key)
+    if payload is None:
+        payload = figure_json.dumps(fn(*args))
+        with _lock:
+            _entries[key] = payload
+            while len(_entries) > MAX_SIZE:
+                _entries.popitem(last=False)
+    return figure_json.loads(payload)
+
+
+# Beim Wechsel des Datenstands alle Figuren verwerfen
+data_store.on_swap(clear)
+
+
+# Alle Argumente einschließlich der Standardwerte, damit f(2024) und der
+# Aufruf durch Dash mit f(2024, None) denselben Eintrag treffen
+def _arguments(signature, args, kwargs={}):
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return bound.args
+
+
+# Dekorator für Callbacks, deren Ergebnis nur von den Argumenten abhängt.
+# warm_up() berechnet den Callback für alle Werte von column in dataset vor
+# (Standard: alle Jahre), bei options (Argument -> Werte) zusätzlich für jede
+# Kombination dieser Werte. warm=False für Callbacks mit vielen Werten (z. B.
+# einer Figur je Land), die sonst die Jahresfiguren aus dem Cache verdrängen.
+def memoize(name, dataset, column='Jahr', warm=True, options=None):
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        if warm:
+            _registry[name] = (fn, signature, dataset, column, options or {})
+        if MAX_SIZE <= 0:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            args = _arguments(signature, args)
+            return _lookup((name,) + args, fn, args)
+
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+# Berechnet alle registrierten Callbacks für jeden Wert ihres Datensatzes vor
+def warm_up():
+    calls = []
+    for name, (fn, signature, dataset, column, options) in _registry.items():
+        values = data_store.get(dataset)[column].unique()
+        for value in sorted(int(v) if column == 'Jahr' else str(v) for v in values):
+            for combination in itertools.product(*options.values()):
+                calls.append((name, fn, _arguments(signature, (value,), dict(zip(options, combination)))))
+    if len(calls) > MAX_SIZE:
+        print(f'Vorberechnung: {len(calls)} Figuren, aber TRADE_FIGURE_CACHE_SIZE={MAX_SIZE}', file=sys.stderr)
+
+    for name, fn, args in calls:
+        try:
+            _lookup((name,) + args, fn, args)
+        except Exception as e:
+            print(f'Vorberechnung {name}/{"/".join(map(str, args))} fehlgeschlagen: {e!r}', file=sys.stderr)
@@ -0,0 +1,112 @@
+# Kompakte Serialisierung der Figuren.
+#
+# Jede plotly-Figur trägt ihr komplettes Template mit (beim Standard-Template
+# 'plotly' rund 7 KB pro Figur), obwohl die Seiten nur Balken- und
+# Liniendiagramme zeigen. Beim Import wird daher das Template 'trade' als
+# Standard gesetzt: dasselbe Aussehen wie 'plotly', aber nur mit den Einträgen
+# für bar und scatter und ohne die Layout-Teile für Polar-, Ternär-, 3D- und
+# Kartendiagramme sowie Farbskalen.
+#
+# dumps() serialisiert mit orjson (falls installiert) und schickt ganzzahlige
+# numpy-Spalten als Float64-Typed-Arrays statt als Zahlenlisten; plotly.js
+# kennt keine Int64-Arrays, bis 2**53 ist die Umwandlung verlustfrei.
+import base64
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ENGINE = 'orjson' if orjson is not None else 'json'
+
+TEMPLATE_NAME = 'trade'
+TRACE_TYPES = ['bar', 'scatter']
+UNUSED_LAYOUT = ['polar', 'ternary', 'scene', 'geo', 'coloraxis', 'colorscale']
+
+ARRAY_PROPS = ['x', 'y']
+MAX_EXACT = 2 ** 53
+
+# numpy-Typ -> Kürzel der Typed Arrays in plotly.js
+TYPED_ARRAYS = {
+    'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8',
+}
+# Kleinere Typen, in die Int64-Werte verlustfrei passen
+NARROW_INTS = {'i': ['int8', 'int16', 'int32'], 'u': ['uint8', 'uint16', 'uint32']}
+
+
+def _build_template():
+    spec = pio.templates['plotly'].to_plotly_json()
+    return go.layout.Template(
+        data={name: spec['data'][name] for name in TRACE_TYPES},
+        layout={key: value for key, value in spec['layout'].items() if key not in UNUSED_LAYOUT}
+    )
+
+
+pio.templates[TEMPLATE_NAME] = _build_template()
+pio.templates.default = TEMPLATE_NAME
+pio.json.config.default_engine = ENGINE
+
+# Das Template als JSON, für Figuren, die direkt als dict gebaut werden
+TEMPLATE = pio.templates[TEMPLATE_NAME].to_plotly_json()
+
+
+def _compact(fig):
+    for trace in fig.data:
+        for prop in ARRAY_PROPS:
+            values = trace[prop] if prop in trace else None
+            if (isinstance(values, np.ndarray) and values.dtype.kind in 'iu' and values.dtype.itemsize == 8
+                    and len(values) and np.abs(values).max() < MAX_EXACT):
+                trace[prop] = values.astype('float64')
+    return fig
+
+
+def _narrow(values):
+    low, high = values.min(), values.max()
+    for dtype in NARROW_INTS[values.dtype.kind]:
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    if -MAX_EXACT < low and high < MAX_EXACT:
+        return values.astype('float64')
+    return None
+
+
+# Array für eine als dict gebaute Figur als Typed Array ({'dtype', 'bdata'},
+# bei mehreren Dimensionen mit 'shape'). Int64 wird wie bei plotly auf den
+# kleinsten passenden Typ verkleinert, sonst Float64; alles andere (z. B.
+# Beschriftungen) und leere Arrays als Liste.
+def typed_array(values):
+    values = np.asarray(values)
+    if values.size and values.dtype.kind in 'iu' and values.dtype.itemsize == 8:
+        narrow = _narrow(values)
+        if narrow is None:
+            return values.tolist()
+        values = narrow
+    if not values.size or values.dtype.name not in TYPED_ARRAYS:
+        return values.tolist()
+    values = np.ascontiguousarray(values, dtype=values.dtype.newbyteorder('<'))
+    spec = {'dtype': TYPED_ARRAYS[values.dtype.name], 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in values.shape)
+    return spec
+
+
+# JSON-Text eines Callback-Ergebnisses (Figur, Liste von Figuren oder
+# sonstige JSON-fähige Werte)
+def dumps(value):
+    if isinstance(value, go.Figure):
+        value = _compact(value)
+    elif isinstance(value, (list, tuple)):
+        value = [_compact(item) if isinstance(item, go.Figure) else item for item in value]
+    return to_json_plotly(value, engine=ENGINE)
+
+
+def loads(payload):
+    if orjson is not None:
+        return orjson.loads(payload)
+    return pio.json.from_json_plotly(payload)
@@ -0,0 +1,46 @@
+# Zeitreihenindex über die Monatswerte der Warengruppen (aggregated_df).
+#
+# Die Tabelle wird einmal nach Code, Jahr und Monat sortiert; jede
+# Warengruppe belegt danach einen zusammenhängenden Bereich in den
+# Spalten-Arrays. Die Reihe eines Codes ist ein Dictionary-Zugriff plus
+# Slices, auch bei der Auswahl mehrerer Codes ohne Maske über alle Zeilen.
+import numpy as np
+
+import data_store
+import metrics
+
+VALUE_COLUMNS = ['Ausfuhr: Wert', 'Einfuhr: Wert', 'Handelsvolumen']
+
+
+class GoodsSeries:
+    def __init__(self, df, columns=VALUE_COLUMNS):
+        frame = df.sort_values(['Code', 'Jahr', 'Monat'], kind='stable', ignore_index=True)
+        codes = frame['Code'].cat.codes.to_numpy()
+        present = np.unique(codes)
+        starts = np.searchsorted(codes, present, side='left')
+        stops = np.searchsorted(codes, present, side='right')
+
+        # Codes in der Reihenfolge der Kategorien (WA01, WA02, ...) mit ihrer Bezeichnung
+        self.codes = [str(code) for code in frame['Code'].cat.categories[present]]
+        self.labels = dict(zip(self.codes, frame['Label'].astype(str).to_numpy()[starts]))
+        self._bounds = dict(zip(self.codes, zip(starts, stops)))
+
+        # Monat als Datum 'JJJJ-MM' für eine Datumsachse
+        years = frame['Jahr'].to_numpy().astype(str)
+        months = np.char.zfill(frame['Monat'].to_numpy().astype(str), 2)
+        self._columns = {column: frame[column].to_numpy() for column in columns}
+        self._columns['Monat'] = np.char.add(np.char.add(years, '-'), months)
+
+    def __contains__(self, code):
+        return code in self._bounds
+
+    # Spalte -> Werte des Codes (Slices ohne Kopie), nach Monat sortiert
+    def series(self, code):
+        start, stop = self._bounds[code]
+        metrics.count_rows(stop - start)
+        return {column: values[start:stop] for column, values in self._columns.items()}
+
+
+# Index über alle Zeilen von aggregated_df (einmal pro Datenstand aufgebaut)
+def get():
+    return data_store.cached('goods_series', lambda: GoodsSeries(data_store.get('aggregated_df')))
@@ -0,0 +1,111 @@
+from dash import dcc, html
+from dash.dependencies import Input, Output
+import numpy as np
+
+import axis_ticks
+import country_index
+import figure_cache
+import figure_json
+
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'export_import_with_germany',
+    'title': 'Gesamter Export-, Import- und Handelsvolumen-Verlauf mit Deutschland',
+    'nav': ['Länderanalyse', 'Gesamtüberblick seit 2008 bis 2024'],
+    'order': 110,
+    'data': ['df_grouped'],
+    'key': 'Land',
+}
+
+DEFAULT_COUNTRY = 'Vereinigte Staaten von Amerika'
+
+# (Spalte, Name, Farbe, Rangspalte) der Verlaufslinien
+LINES = [
+    ('export_wert', 'Export', '#1f77b4', 'export_ranking'),
+    ('import_wert', 'Import', '#ff7f0e', 'import_ranking'),
+    ('handelsvolumen_wert', 'Handelsvolumen', '#2ca02c', 'handelsvolumen_ranking'),
+]
+
+# Gemeinsame Basis der beiden Figuren (einmal erzeugt, pro Aufruf nur ergänzt)
+LAYOUT = {
+    'template': figure_json.TEMPLATE,
+    'xaxis': {'title': {'text': 'Jahr'}, 'dtick': 1},
+    'yaxis': {'title': {'text': 'Wert in €'}},
+}
+
+def create_layout():
+    countries = country_index.get_series().countries
+
+    return html.Div([
+        html.H1("Handel mit Deutschland nach Land"),
+
+        dcc.Dropdown(
+            id='land_dropdown',
+            options=[{'label': land, 'value': land} for land in countries],
+            value=DEFAULT_COUNTRY if DEFAULT_COUNTRY in countries else countries[0],
+            clearable=False,
+            style={'width': '50%'}
+        ),
+
+        dcc.Graph(id='land_verlauf_graph'),
+        dcc.Graph(id='land_bilanz_graph'),
+    ])
+
+# Y-Achse mit Ticks passend zur Größenordnung des Landes
+def _yaxis(low, high):
+    low, high = min(low, 0), max(high, 0)
+    tickvals, ticktext = axis_ticks.ticks(low, high, axis_ticks.step(low, high))
+    return dict(LAYOUT['yaxis'], tickvals=figure_json.typed_array(tickvals), ticktext=ticktext)
+
+def register_callbacks(app):
+    @app.callback(
+        [Output('land_verlauf_graph', 'figure'),
+         Output('land_bilanz_graph', 'figure')],
+        Input('land_dropdown', 'value')
+    )
+    @figure_cache.memoize('export_import_with_germany', 'df_grouped', 'Land', warm=False)
+    def update_graphs(land):
+        series = country_index.get_series().series(land)
+        years = figure_json.typed_array(series['Jahr'])
+
+        # Verlauf von Export, Import und Handelsvolumen mit Rang im Jahr
+        lines = [{
+            'type': 'scatter',
+            'mode': 'lines+markers',
+            'name': name,
+            'x': years,
+            'y': figure_json.typed_array(series[column]),
+            'customdata': figure_json.typed_array(series[ranking]),
+            'line': {'width': 2, 'color': color},
+            'hovertemplate': f'<b>{name}</b><br>Jahr: %{{x}}<br>Wert: %{{y:,.0f}} €<br>Rang: %{{customdata}}<extra></extra>',
+        } for column, name, color, ranking in LINES]
+        high = max(series[column].max() for column, _, _, _ in LINES)
+        fig_verlauf = {
+            'data': lines,
+            'layout': dict(
+                LAYOUT,
+                title={'text': f'Export, Import und Handelsvolumen zwischen Deutschland und {land}'},
+                yaxis=_yaxis(0, high),
+                legend={'title': {'text': 'Kategorie'}, 'bgcolor': 'rgba(255,255,255,0.7)'},
+            ),
+        }
+
+        # Handelsbilanz aus deutscher Sicht: grün bei Überschuss, rot bei Defizit
+        bilanz = series['handelsbilanz']
+        fig_bilanz = {
+            'data': [{
+                'type': 'bar',
+                'name': 'Handelsbilanz',
+                'x': years,
+                'y': figure_json.typed_array(bilanz),
+                'marker': {'color': np.where(bilanz > 0, 'green', 'red').tolist()},
+                'hovertemplate': '<b>Handelsbilanz</b><br>Jahr: %{x}<br>Wert: %{y:,.0f} €<extra></extra>',
+            }],
+            'layout': dict(
+                LAYOUT,
+                title={'text': f'Handelsbilanz Deutschlands mit {land}'},
+                yaxis=_yaxis(bilanz.min(), bilanz.max()),
+            ),
+        }
+
+        return fig_verlauf, fig_bilanz
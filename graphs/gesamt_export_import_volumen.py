@@ -1,15 +1,22 @@
 import dash
 from dash import dcc, html
-import pandas as pd
 import plotly.graph_objects as go
-import numpy as np
+
+import axis_ticks
+import data_store
+
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'gesamt_export_import_volumen',
+    'title': 'Gesamter Export-, Import- und Handelsvolumen-Verlauf Deutschlands',
+    'nav': ['Überblick über Deutschlands Handel', 'Gesamtüberblick seit 2008 bis 2024'],
+    'order': 10,
+    'data': ['1gesamt_deutschland'],
+}
 
 def create_layout():
-    # CSV file path
-    data_file = 'data/1gesamt_deutschland.csv'
-    
     # Read data
-    df_gesamt_deutschland = pd.read_csv(data_file)
+    df_gesamt_deutschland = data_store.get('1gesamt_deutschland')
 
     # Create the graph
     fig = go.Figure()
@@ -32,7 +39,7 @@ def create_layout():
     # Calculate Y-axis tick values
     max_value = df_gesamt_deutschland[['gesamt_export', 'gesamt_import', 'gesamt_handelsvolumen']].values.max()
     tick_step = 500e9  # 500 Mrd as step size
-    tickvals = np.arange(0, max_value + tick_step, tick_step)
+    tickvals, ticktext = axis_ticks.ticks(0, max_value, tick_step)
 
     # Layout settings
     fig.update_layout(
@@ -42,7 +49,7 @@ def create_layout():
         yaxis=dict(
             tickformat=',',
             tickvals=tickvals,
-            ticktext=[f"{val/1e9:.0f} Mrd" for val in tickvals]
+            ticktext=ticktext
         ),
         legend=dict(title='Kategorie', bgcolor='rgba(255,255,255,0.7)')
     )
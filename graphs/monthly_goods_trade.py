@@ -0,0 +1,96 @@
+from dash import dcc, html
+from dash.dependencies import Input, Output
+
+import axis_ticks
+import figure_json
+import goods_index
+
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'monthly_goods_trade',
+    'title': 'Monatlicher Verlauf nach Warengruppe',
+    'nav': ['Warenanalyse', 'Gesamtüberblick seit 2008 bis 2024'],
+    'order': 210,
+    'data': ['aggregated_df'],
+    'key': 'Code',
+}
+
+DEFAULT_CODES = ['WA87', 'WA84', 'WA85']
+
+METRICS = {
+    'Ausfuhr: Wert': 'Export',
+    'Einfuhr: Wert': 'Import',
+    'Handelsvolumen': 'Handelsvolumen',
+}
+
+# Gemeinsame Basis der Figur (einmal erzeugt, pro Aufruf nur ergänzt)
+LAYOUT = {
+    'template': figure_json.TEMPLATE,
+    'xaxis': {'title': {'text': 'Monat'}, 'type': 'date', 'tickformat': '%Y'},
+    'yaxis': {'title': {'text': 'Wert in €'}},
+    'legend': {'title': {'text': 'Warengruppe'}, 'bgcolor': 'rgba(255,255,255,0.7)'},
+    'hovermode': 'x unified',
+}
+
+def create_layout():
+    index = goods_index.get()
+
+    return html.Div([
+        html.H1("Monatlicher Handelsverlauf nach Warengruppe"),
+
+        dcc.Dropdown(
+            id='waren_dropdown',
+            options=[{'label': f'{code} {index.labels[code]}', 'value': code} for code in index.codes],
+            value=[code for code in DEFAULT_CODES if code in index],
+            multi=True,
+            placeholder='Warengruppen auswählen',
+        ),
+
+        dcc.RadioItems(
+            id='waren_kennzahl',
+            options=[{'label': name, 'value': column} for column, name in METRICS.items()],
+            value='Ausfuhr: Wert',
+            inline=True,
+            inputStyle={'marginRight': '5px', 'marginLeft': '15px'},
+        ),
+
+        dcc.Graph(id='waren_verlauf_graph'),
+    ])
+
+def register_callbacks(app):
+    @app.callback(
+        Output('waren_verlauf_graph', 'figure'),
+        [Input('waren_dropdown', 'value'),
+         Input('waren_kennzahl', 'value')]
+    )
+    def update_graph(codes, metric):
+        index = goods_index.get()
+        codes = [code for code in codes or [] if code in index]
+        name = METRICS[metric]
+
+        # Eine Linie pro ausgewählter Warengruppe
+        traces = []
+        high = 0
+        for code in codes:
+            series = index.series(code)
+            values = series[metric]
+            if len(values):
+                high = max(high, values.max())
+            traces.append({
+                'type': 'scatter',
+                'mode': 'lines',
+                'name': f'{code} {index.labels[code]}',
+                'x': series['Monat'].tolist(),
+                'y': figure_json.typed_array(values),
+                'hovertemplate': f'{code}: %{{y:,.0f}} €<extra></extra>',
+            })
+
+        tickvals, ticktext = axis_ticks.ticks(0, high, axis_ticks.step(0, high))
+        return {
+            'data': traces,
+            'layout': dict(
+                LAYOUT,
+                title={'text': f'Monatlicher {name} nach Warengruppe'},
+                yaxis=dict(LAYOUT['yaxis'], tickvals=figure_json.typed_array(tickvals), ticktext=ticktext),
+            ),
+        }
@@ -1,80 +1,129 @@
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import pandas as pd
 import plotly.graph_objects as go
 import numpy as np
-import math
 
-# CSV-Datei einlesen
-data_file = 'data/gesamt_deutschland_monthly.csv'
-gesamt_deutschland_monthly = pd.read_csv(data_file)
+import axis_ticks
+import clientside
+import data_api
+import data_store
+import figure_cache
+import trade_cube
 
-# Funktion zur Formatierung der Y-Achse
-def formatter(value):
-    if value >= 1e9:
-        return f'{value / 1e9:.0f} Mrd'
-    elif value >= 1e6:
-        return f'{value / 1e6:.0f} Mio'
-    else:
-        return str(value)
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'monthly_trade',
+    'title': 'Monatlicher Handelsverlauf',
+    'nav': ['Überblick über Deutschlands Handel', 'Überblick nach bestimmtem Jahr'],
+    'order': 20,
+    'data': ['gesamt_deutschland_monthly', 'aggregated_df', 'df_grouped'],
+}
+
+VALUE_COLUMNS = ['export_wert', 'import_wert', 'handelsvolumen_wert']
+
+MONTHS = ['Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun', 'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez']
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+
+# Granularität -> (Auswahl, Titel, Achse, Achsenbeschriftungen, Tick-Schritt, Tick-Ausrichtung);
+# Monatswerte direkt aus gesamt_deutschland_monthly, alle anderen vorberechnet aus trade_cube
+GRANULARITIES = {
+    'month': ('Monat', 'Monatlicher Export-, Import- und Handelsverlauf Deutschlands im Jahr {year}',
+              'Monat', MONTHS, 25e9, 50e9),
+    'quarter': ('Quartal', 'Quartalsweiser Export-, Import- und Handelsverlauf Deutschlands im Jahr {year}',
+                'Quartal', QUARTERS, 100e9, None),
+    'ytd': ('Kumuliert seit Jahresbeginn',
+            'Kumulierter Export-, Import- und Handelsverlauf Deutschlands seit Jahresbeginn {year}',
+            'Monat', MONTHS, 500e9, None),
+    'rolling12': ('Gleitende 12 Monate',
+                  'Export, Import und Handelsvolumen Deutschlands der jeweils letzten 12 Monate im Jahr {year}',
+                  'Monat', MONTHS, 500e9, None),
+}
 
 def create_layout():
+    gesamt_deutschland_monthly = data_store.get('gesamt_deutschland_monthly')
+    years = sorted(gesamt_deutschland_monthly['Jahr'].unique())
+
     return html.Div([
         html.H1("Monatlicher Handelsverlauf Deutschlands"),
 
         dcc.Dropdown(
             id='jahr_dropdown',
-            options=[{'label': str(j), 'value': j} for j in sorted(gesamt_deutschland_monthly['Jahr'].unique())],
+            options=[{'label': str(j), 'value': j} for j in years],
             value=2024,  # Standardwert
             clearable=False,
             style={'width': '50%'}
         ),
 
+        dcc.RadioItems(
+            id='granularitaet_monatlich',
+            options=[{'label': option[0], 'value': key} for key, option in GRANULARITIES.items()],
+            value='month',
+            inline=True,
+            inputStyle={'marginRight': '5px', 'marginLeft': '15px'},
+        ),
+
         dcc.Graph(id='monatlicher_handel_graph'),
 
-        dcc.Store(id='monatlicher_handel_data', data=gesamt_deutschland_monthly.to_dict('records'))
+        # Nur ein Verweis auf die Daten; Jahreswerte gibt es bei Bedarf über /api/data
+        dcc.Store(id='monatlicher_handel_data', data=data_api.dataset_key('gesamt_deutschland_monthly')),
+
+        # Figuren je Jahr und Granularität für den optionalen Clientside-Modus
+        clientside.store('monthly_trade', [(year, key) for year in years for key in GRANULARITIES])
     ])
 
 # Callback-Funktion für die Aktualisierung des Graphen
 def register_callbacks(app):
-    @app.callback(
+    @clientside.callback(
+        app, 'monthly_trade',
         Output('monatlicher_handel_graph', 'figure'),
-        Input('jahr_dropdown', 'value')
+        [Input('jahr_dropdown', 'value'),
+         Input('granularitaet_monatlich', 'value')]
     )
-    def update_graph(year_selected):
-        df_year_monthly = gesamt_deutschland_monthly[gesamt_deutschland_monthly['Jahr'] == year_selected]
+    @figure_cache.memoize('monthly_trade', 'gesamt_deutschland_monthly',
+                          options={'granularity': list(GRANULARITIES)})
+    def update_graph(year_selected, granularity='month'):
+        _, title, axis_title, axis_labels, step, align = GRANULARITIES[granularity]
+
+        if granularity == 'month':
+            df_year_monthly = data_store.year_slice(data_store.get('gesamt_deutschland_monthly'), year_selected)
+            periods = df_year_monthly['Monat'].to_numpy()
+            values = [df_year_monthly[column].to_numpy() for column in VALUE_COLUMNS]
+        else:
+            # Nur Perioden mit vollständigen Daten; Werte als Slices der vorberechneten Arrays
+            cube = trade_cube.get()
+            periods = cube.periods(granularity, year_selected).astype(np.int8)
+            values = [cube.slice(measure, granularity, years=[year_selected])[0, periods - 1]
+                      for measure in trade_cube.MEASURES]
 
         fig = go.Figure()
 
-        for col, name, color in zip(
-            ['export_wert', 'import_wert', 'handelsvolumen_wert'],
+        for y, name, color in zip(
+            values,
             ['Exportvolumen', 'Importvolumen', 'Gesamthandelsvolumen'],
             ['#1f77b4', '#ff7f0e', '#2ca02c']
         ):
             fig.add_trace(go.Scatter(
-                x=df_year_monthly['Monat'],
-                y=df_year_monthly[col],
+                x=periods,
+                y=y,
                 mode='lines+markers',
                 name=name,
                 line=dict(width=2, color=color),
-                hovertemplate=f'<b>{name}</b><br>Monat: %{{x}}<br>Wert: %{{y:,.0f}} €<extra></extra>'
+                hovertemplate=f'<b>{name}</b><br>{axis_title}: %{{x}}<br>Wert: %{{y:,.0f}} €<extra></extra>'
             ))
 
         # Maximale Werte bestimmen und Y-Achse skalieren
-        max_value = df_year_monthly[['export_wert', 'import_wert', 'handelsvolumen_wert']].values.max()
-        rounded_max = math.ceil(max_value / 50e9) * 50e9
-        tickvals = np.arange(0, rounded_max + 1, 25e9)
-        ticktext = [formatter(val) for val in tickvals]
+        max_value = max((y.max() for y in values if len(y)), default=np.nan)
+        tickvals, ticktext = axis_ticks.ticks(0, max_value, step, align=align)
 
         fig.update_layout(
-            title=f'Monatlicher Export-, Import- und Handelsverlauf Deutschlands im Jahr {year_selected}',
-            xaxis_title='Monat',
+            title=title.format(year=year_selected),
+            xaxis_title=axis_title,
             yaxis_title='Wert in €',
             xaxis=dict(
                 tickmode='array',
-                tickvals=list(range(1, 13)),
-                ticktext=['Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun', 'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez']
+                tickvals=list(range(1, len(axis_labels) + 1)),
+                ticktext=axis_labels
             ),
             yaxis=dict(
                 tickvals=tickvals,
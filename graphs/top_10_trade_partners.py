@@ -1,35 +1,34 @@
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import pandas as pd
 import plotly.graph_objects as go
-import numpy as np
-import math
-import os
 
-# Daten laden
-df_path = os.path.join("data", "df_grouped.csv")
-df_grouped = pd.read_csv(df_path)
+import axis_ticks
+import clientside
+import country_index
+import data_store
+import figure_cache
 
-# Funktion zur Formatierung der Y-Achse
-def formatter(value):
-    if value >= 1e9:
-        return f'{value / 1e9:.0f} Mrd'
-    elif value >= 1e6:
-        return f'{value / 1e6:.0f} Mio'
-    elif value >= 1e3:
-        return f'{value / 1e3:.0f} K'
-    else:
-        return str(value)
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'top_10_trade_partners',
+    'title': 'Top 10 Handelspartner',
+    'nav': ['Überblick über Deutschlands Handel', 'Überblick nach bestimmtem Jahr'],
+    'order': 30,
+    'data': ['df_grouped'],
+}
 
 # Layout-Funktion
 def create_layout():
+    df_grouped = data_store.get('df_grouped')
+    years = sorted(df_grouped['Jahr'].unique())
+
     return html.Div([
         html.H1("Top 10 Handelspartner Deutschlands"),
         
         dcc.Dropdown(
             id='jahr_dropdown',
-            options=[{'label': str(j), 'value': j} for j in sorted(df_grouped['Jahr'].unique())],
+            options=[{'label': str(j), 'value': j} for j in years],
             value=2024,
             clearable=False,
             style={'width': '50%'}
@@ -38,24 +37,27 @@ def create_layout():
         dcc.Graph(id='export_graph'),
         dcc.Graph(id='import_graph'),
         dcc.Graph(id='handelsvolumen_graph'),
+
+        # Jahresfiguren für den optionalen Clientside-Modus
+        clientside.store('top_10_trade_partners', years),
     ])
 
 # Callback-Registrierung
 def register_callbacks(app):
-    @app.callback(
+    @clientside.callback(
+        app, 'top_10_trade_partners',
         [Output('export_graph', 'figure'),
          Output('import_graph', 'figure'),
          Output('handelsvolumen_graph', 'figure')],
         Input('jahr_dropdown', 'value')
     )
+    @figure_cache.memoize('top_10_trade_partners', 'df_grouped')
     def update_graphs(year_selected):
-        top_10_export = df_grouped[(df_grouped['export_ranking'] <= 10) & (df_grouped['Jahr'] == year_selected)][["Land", "export_wert"]]
-        top_10_import = df_grouped[(df_grouped['import_ranking'] <= 10) & (df_grouped['Jahr'] == year_selected)][["Land", "import_wert"]]
-        top_10_handelsvolumen = df_grouped[(df_grouped['handelsvolumen_ranking'] <= 10) & (df_grouped['Jahr'] == year_selected)][["Land", "handelsvolumen_wert"]]
-
-        top_10_export = top_10_export.sort_values(by="export_wert", ascending=False)
-        top_10_import = top_10_import.sort_values(by="import_wert", ascending=False)
-        top_10_handelsvolumen = top_10_handelsvolumen.sort_values(by="handelsvolumen_wert", ascending=False)
+        # Nach Rang sortiert und damit absteigend nach Wert
+        index = country_index.get()
+        top_10_export = index.rank_le(year_selected, 'export_ranking', 10)[["Land", "export_wert"]]
+        top_10_import = index.rank_le(year_selected, 'import_ranking', 10)[["Land", "import_wert"]]
+        top_10_handelsvolumen = index.rank_le(year_selected, 'handelsvolumen_ranking', 10)[["Land", "handelsvolumen_wert"]]
 
         # Maximale Werte für Skalierung
         max_export = top_10_export['export_wert'].max()
@@ -64,9 +66,7 @@ def register_callbacks(app):
 
         # Die höchste Zahl für die Y-Achse ermitteln
         max_value = max(max_export, max_import, max_handelsvolumen)
-        rounded_max = math.ceil(max_value / 50e9) * 50e9
-        tickvals = np.arange(0, rounded_max + 1, 50e9)
-        ticktext = [formatter(val) for val in tickvals]
+        tickvals, ticktext = axis_ticks.ticks(0, max_value, 50e9)
 
         # Export Grafik
         fig_export = go.Figure([go.Bar(
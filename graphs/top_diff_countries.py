@@ -1,39 +1,74 @@
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import pandas as pd
-import plotly.graph_objects as go
 import numpy as np
-import math
-import os
 
-# Daten laden (Pfad für Render anpassen)
-data_path = os.path.join("data", "df_grouped.csv")
-df_grouped = pd.read_csv(data_path)
+import axis_ticks
+import country_index
+import data_store
+import diverging_bars
+import figure_cache
+import year_compare
+import year_range
 
-# Funktion zum Formatieren der x-Achse (Mrd)
-def formatter(x, pos):
-    return f'{int(x * 1e-9)} Mrd' if abs(x) >= 1e9 else f'{int(x)}'
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'top_diff_countries',
+    'title': 'Länder mit größten Export- und Importzuwächsen (absolut)',
+    'nav': ['Überblick über Deutschlands Handel', 'Überblick nach bestimmtem Jahr'],
+    'order': 40,
+    'data': ['df_grouped'],
+}
 
-# Funktion zum Berechnen der Achsen-Ticks (nur Mrd)
-def generate_ticks(min_value, max_value, step_size):
-    min_tick = math.floor(min_value / step_size) * step_size
-    max_tick = math.ceil(max_value / step_size) * step_size
-    return np.arange(min_tick, max_tick + step_size, step_size)
+# Kennzahl -> (Titel, Figurenbasis)
+FIGURES = {
+    'export_differenz': ('Exportdifferenzen', diverging_bars.DivergingBars(
+        'Top 4 Zuwächse', 'Top 4 Rückgänge',
+        'Höhe des Exportzuwachses: %{x:,.0f} €<extra></extra>',
+        'Höhe des Exportrückgangs: %{x:,.0f} €<extra></extra>'
+    )),
+    'import_differenz': ('Importdifferenzen', diverging_bars.DivergingBars(
+        'Top 4 Zuwächse', 'Top 4 Rückgänge',
+        'Höhe des Importzuwachses: %{x:,.0f} €<extra></extra>',
+        'Höhe des Importrückgangs: %{x:,.0f} €<extra></extra>'
+    )),
+    'handelsvolumen_differenz': ('Handelsvolumendifferenzen', diverging_bars.DivergingBars(
+        'Top 4 Zuwächse', 'Top 4 Rückgänge',
+        'Höhe des Handelszuwachses: %{x:,.0f} €<extra></extra>',
+        'Höhe des Handelsrückgangs: %{x:,.0f} €<extra></extra>'
+    )),
+}
+
+# Differenzen zwischen zwei beliebigen Jahren (späteres minus früheres Jahr)
+RANGE = year_compare.RangeComparison(
+    year_range.countries,
+    {'export_differenz': 'export_wert', 'import_differenz': 'import_wert',
+     'handelsvolumen_differenz': 'handelsvolumen_wert'},
+    year_range.YearRange.diff,
+    FIGURES,
+    title=lambda title, start, end: f'{title} {end} gegenüber {start}',
+    xaxis=year_compare.span_ticks,
+    keep=lambda data, start, end: ~np.isin(data.entities, country_index.NON_COUNTRIES),
+)
 
 # Layout für das Diagramm
 def create_layout():
+    df_grouped = data_store.get('df_grouped')
+    years = sorted(df_grouped['Jahr'].unique())
+
     return html.Div([
         html.H1("Länder mit größten Handelsdifferenzen pro Jahr"),
 
         # Dropdown-Menü für Jahrsauswahl
         dcc.Dropdown(
             id='jahr_dropdown_2',
-            options=[{'label': str(j), 'value': j} for j in sorted(df_grouped['Jahr'].unique())],
+            options=[{'label': str(j), 'value': j} for j in years],
             value=2024,  # Standardwert
             clearable=False,
             style={'width': '50%'}
         ),
 
+        year_compare.dropdown('vergleich_dropdown_2', years),
+
         # Graphen für Export-, Import- und Handelsvolumen-Differenzen
         dcc.Graph(id='export_diff_graph'),
         dcc.Graph(id='import_diff_graph'),
@@ -46,103 +81,31 @@ def register_callbacks(app):
         [Output('export_diff_graph', 'figure'),
          Output('import_diff_graph', 'figure'),
          Output('handelsvolumen_diff_graph', 'figure')],
-        Input('jahr_dropdown_2', 'value')
+        [Input('jahr_dropdown_2', 'value'),
+         Input('vergleich_dropdown_2', 'value')]
     )
-    def update_graphs(year_selected):
-        df_filtered = df_grouped[df_grouped['Jahr'] == year_selected]
-        df_filtered = df_filtered[~df_filtered['Land'].isin(['Nicht ermittelte Länder und Gebiete', 'Schiffs- und Luftfahrzeugbedarf'])]
-
-        # Export-Differenzen: Top 4 und Bottom 4
-        top_4_export_diff = df_filtered.nlargest(4, 'export_differenz')
-        bottom_4_export_diff = df_filtered.nsmallest(4, 'export_differenz')
-        export_diff_min = min(bottom_4_export_diff['export_differenz'].min(), 0)
-        export_diff_max = max(top_4_export_diff['export_differenz'].max(), 0)
+    @figure_cache.memoize('top_diff_countries', 'df_grouped')
+    def update_graphs(year_selected, compare_year=None):
+        figures = RANGE.figures(year_selected, compare_year)
+        if figures is not None:
+            return figures
 
-        # Import-Differenzen: Top 4 und Bottom 4
-        top_4_import_diff = df_filtered.nlargest(4, 'import_differenz')
-        bottom_4_import_diff = df_filtered.nsmallest(4, 'import_differenz')
-        import_diff_min = min(bottom_4_import_diff['import_differenz'].min(), 0)
-        import_diff_max = max(top_4_import_diff['import_differenz'].max(), 0)
-
-        # Handelsvolumen-Differenzen: Top 4 und Bottom 4
-        top_4_handelsvolumen_diff = df_filtered.nlargest(4, 'handelsvolumen_differenz')
-        bottom_4_handelsvolumen_diff = df_filtered.nsmallest(4, 'handelsvolumen_differenz')
-        handelsvolumen_diff_min = min(bottom_4_handelsvolumen_diff['handelsvolumen_differenz'].min(), 0)
-        handelsvolumen_diff_max = max(top_4_handelsvolumen_diff['handelsvolumen_differenz'].max(), 0)
-
-        # Achsen-Ticks berechnen
+        index = country_index.get()
         step_size = 1e9  # Schrittwert immer 1 Mrd
-        export_ticks = generate_ticks(export_diff_min, export_diff_max, step_size)
-        import_ticks = generate_ticks(import_diff_min, import_diff_max, step_size)
-        handelsvolumen_ticks = generate_ticks(handelsvolumen_diff_min, handelsvolumen_diff_max, step_size)
-
-        # Diagramm: Exportdifferenzen
-        export_fig = go.Figure()
-        export_fig.add_trace(go.Bar(
-            y=top_4_export_diff['Land'],
-            x=top_4_export_diff['export_differenz'],
-            orientation='h',
-            name='Top 4 Zuwächse',
-            marker_color='green',
-            hovertemplate='Höhe des Exportzuwachses: %{x:,.0f} €<extra></extra>'
-        ))
-        export_fig.add_trace(go.Bar(
-            y=bottom_4_export_diff['Land'],
-            x=bottom_4_export_diff['export_differenz'],
-            orientation='h',
-            name='Top 4 Rückgänge',
-            marker_color='red',
-            hovertemplate='Höhe des Exportrückgangs: %{x:,.0f} €<extra></extra>'
-        ))
-        export_fig.update_layout(
-            title=f'Exportdifferenzen für {year_selected}',
-            xaxis=dict(tickmode='array', tickvals=export_ticks, ticktext=[formatter(val, 0) for val in export_ticks])
-        )
 
-        # Diagramm: Importdifferenzen
-        import_fig = go.Figure()
-        import_fig.add_trace(go.Bar(
-            y=top_4_import_diff['Land'],
-            x=top_4_import_diff['import_differenz'],
-            orientation='h',
-            name='Top 4 Zuwächse',
-            marker_color='green',
-            hovertemplate='Höhe des Importzuwachses: %{x:,.0f} €<extra></extra>'
-        ))
-        import_fig.add_trace(go.Bar(
-            y=bottom_4_import_diff['Land'],
-            x=bottom_4_import_diff['import_differenz'],
-            orientation='h',
-            name='Top 4 Rückgänge',
-            marker_color='red',
-            hovertemplate='Höhe des Importrückgangs: %{x:,.0f} €<extra></extra>'
-        ))
-        import_fig.update_layout(
-            title=f'Importdifferenzen für {year_selected}',
-            xaxis=dict(tickmode='array', tickvals=import_ticks, ticktext=[formatter(val, 0) for val in import_ticks])
-        )
+        figures = []
+        for metric, (title, bars) in FIGURES.items():
+            # Top 4 und Bottom 4 der Kennzahl
+            top_labels, top_values, bottom_labels, bottom_values = index.top_bottom(
+                year_selected, metric, 4, country_index.NON_COUNTRIES)
+            diff_min, diff_max = diverging_bars.value_range(top_values, bottom_values)
 
-        # Diagramm: Handelsvolumendifferenzen
-        handelsvolumen_fig = go.Figure()
-        handelsvolumen_fig.add_trace(go.Bar(
-            y=top_4_handelsvolumen_diff['Land'],
-            x=top_4_handelsvolumen_diff['handelsvolumen_differenz'],
-            orientation='h',
-            name='Top 4 Zuwächse',
-            marker_color='green',
-            hovertemplate='Höhe des Handelszuwachses: %{x:,.0f} €<extra></extra>'
-        ))
-        handelsvolumen_fig.add_trace(go.Bar(
-            y=bottom_4_handelsvolumen_diff['Land'],
-            x=bottom_4_handelsvolumen_diff['handelsvolumen_differenz'],
-            orientation='h',
-            name='Top 4 Rückgänge',
-            marker_color='red',
-            hovertemplate='Höhe des Handelsrückgangs: %{x:,.0f} €<extra></extra>'
-        ))
-        handelsvolumen_fig.update_layout(
-            title=f'Handelsvolumendifferenzen für {year_selected}',
-            xaxis=dict(tickmode='array', tickvals=handelsvolumen_ticks, ticktext=[formatter(val, 0) for val in handelsvolumen_ticks])
-        )
+            # Achsen-Ticks berechnen
+            ticks, ticktext = axis_ticks.ticks(diff_min, diff_max, step_size)
+            figures.append(bars.figure(
+                top_labels, top_values, bottom_labels, bottom_values,
+                title=f'{title} für {year_selected}',
+                xaxis=dict(tickmode='array', tickvals=ticks, ticktext=ticktext)
+            ))
 
-        return export_fig, import_fig, handelsvolumen_fig
+        return tuple(figures)
@@ -1,35 +1,64 @@
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import pandas as pd
-import plotly.graph_objects as go
-import numpy as np
-import math
 
-# CSV-Datei einlesen
-df_reduced = pd.read_csv('data/df_reduced.csv')
+import axis_ticks
+import data_store
+import diverging_bars
+import figure_cache
+import year_compare
+import year_range
 
-# Funktion zum Formatieren der x-Achse
-def formatter(value):
-    if abs(value) >= 1e9:
-        return f'{int(value * 1e-9)} Mrd'
-    elif abs(value) >= 1e6:
-        return f'{int(value * 1e-6)} Mio'
-    elif abs(value) >= 1e3:
-        return f'{int(value * 1e-3)} Tsd'
-    else:
-        return f'{int(value)}'
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'top_diff_goods',
+    'title': 'Waren mit größten Export- und Importzuwächsen (absolut)',
+    'nav': ['Überblick über Deutschlands Handel', 'Überblick nach bestimmtem Jahr'],
+    'order': 70,
+    'data': ['goods_yoy'],
+}
+
+# Kennzahl -> (Export/Import, Figurenbasis)
+FIGURES = {
+    'export_differenz': ('Export', diverging_bars.DivergingBars(
+        'Top 4 Zuwächse', 'Top 4 Rückgänge',
+        'Exportzuwachs: %{x:,.0f} €<extra></extra>',
+        'Exportrückgang: %{x:,.0f} €<extra></extra>',
+        layout=dict(xaxis={'title': {'text': 'Exportdifferenz (EUR)'}}, yaxis={'title': {'text': 'Warengruppe'}})
+    )),
+    'import_differenz': ('Import', diverging_bars.DivergingBars(
+        'Top 4 Zuwächse', 'Top 4 Rückgänge',
+        'Importzuwachs: %{x:,.0f} €<extra></extra>',
+        'Importrückgang: %{x:,.0f} €<extra></extra>',
+        layout=dict(xaxis={'title': {'text': 'Importdifferenz (EUR)'}}, yaxis={'title': {'text': 'Warengruppe'}})
+    )),
+}
+
+# Differenzen zwischen zwei beliebigen Jahren (späteres minus früheres Jahr)
+RANGE = year_compare.RangeComparison(
+    year_range.goods,
+    {'export_differenz': 'Ausfuhr: Wert', 'import_differenz': 'Einfuhr: Wert'},
+    year_range.YearRange.diff,
+    FIGURES,
+    title=lambda kind, start, end: f'{kind}differenzen nach Warengruppe ({end} vs. {start})',
+    xaxis=lambda low, high: dict(year_compare.span_ticks(low, high), range=[low * 1.1, high * 1.3]),
+)
 
 # Layout-Funktion für das Dash-Layout
 def create_layout():
+    goods_yoy = data_store.get('goods_yoy')
+    years = sorted(goods_yoy['Jahr'].unique())
+
     return html.Div([
         html.H1("Handelsdifferenzen nach Warengruppe"),
         dcc.Dropdown(
             id='jahr_dropdown_goods',
-            options=[{'label': str(j), 'value': j} for j in sorted(df_reduced['Jahr'].unique())],
+            options=[{'label': str(j), 'value': j} for j in years],
             value=2024,  
             clearable=False,
             style={'width': '50%'}
         ),
+
+        year_compare.dropdown('vergleich_dropdown_goods', years),
         dcc.Graph(id='export_diff_graph_goods'),
         dcc.Graph(id='import_diff_graph_goods'),
     ])
@@ -39,74 +68,48 @@ def register_callbacks(app):
     @app.callback(
         [Output('export_diff_graph_goods', 'figure'),
          Output('import_diff_graph_goods', 'figure')],
-        Input('jahr_dropdown_goods', 'value')
+        [Input('jahr_dropdown_goods', 'value'),
+         Input('vergleich_dropdown_goods', 'value')]
     )
-    def update_graphs(selected_year):
-        df_current = df_reduced[df_reduced['Jahr'] == selected_year]
-        df_previous = df_reduced[df_reduced['Jahr'] == selected_year - 1]
-        
-        df_diff = pd.merge(df_current, df_previous, on="Label", suffixes=('_current', '_previous'))
-        df_diff['export_differenz'] = df_diff['Ausfuhr: Wert_current'] - df_diff['Ausfuhr: Wert_previous']
-        df_diff['import_differenz'] = df_diff['Einfuhr: Wert_current'] - df_diff['Einfuhr: Wert_previous']
+    @figure_cache.memoize('top_diff_goods', 'goods_yoy')
+    def update_graphs(selected_year, compare_year=None):
+        figures = RANGE.figures(selected_year, compare_year)
+        if figures is not None:
+            return figures
 
-        # Top & Bottom 4 Export-Differenzen
-        top_4_export_diff = df_diff.nlargest(4, 'export_differenz')
-        bottom_4_export_diff = df_diff.nsmallest(4, 'export_differenz')
-        export_diff_min = min(bottom_4_export_diff['export_differenz'].min(), 0)
-        export_diff_max = max(top_4_export_diff['export_differenz'].max(), 0)
+        # Vorjahresvergleich aus der vorberechneten Tabelle (siehe pipeline.goods_yoy)
+        df_diff = data_store.year_slice(data_store.get('goods_yoy'), selected_year)
+        has_previous = df_diff['hat_vorjahr'].any()
 
-        # Top & Bottom 4 Import-Differenzen
-        top_4_import_diff = df_diff.nlargest(4, 'import_differenz')
-        bottom_4_import_diff = df_diff.nsmallest(4, 'import_differenz')
-        import_diff_min = min(bottom_4_import_diff['import_differenz'].min(), 0)
-        import_diff_max = max(top_4_import_diff['import_differenz'].max(), 0)
+        # Top & Bottom 4 für Export und Import in einem Durchgang;
+        # Warengruppen ohne Vorjahreswert (NaN) werden ausgelassen
+        metrics = list(FIGURES)
+        selection = diverging_bars.select(df_diff[metrics].to_numpy(), 4)
+        labels = df_diff['Label'].to_numpy()
 
-        # Achsenticks generieren
         step_size = 2e9
-        export_ticks = np.arange(math.floor(export_diff_min / step_size) * step_size,
-                                math.ceil(export_diff_max / step_size) * step_size + step_size, step_size)
+        figures = []
+        for metric, (top, bottom) in zip(metrics, selection):
+            kind, bars = FIGURES[metric]
+            if not has_previous:
+                # Erstes Jahr der Daten: kein Vergleich möglich
+                figures.append(bars.figure(
+                    [], [], [], [],
+                    title=f'{kind}differenzen nach Warengruppe: keine Vorjahreswerte für {selected_year}'
+                ))
+                continue
 
-        import_ticks = np.arange(math.floor(import_diff_min / step_size) * step_size,
-                                math.ceil(import_diff_max / step_size) * step_size + step_size, step_size)
+            values = df_diff[metric].to_numpy()
+            diff_min, diff_max = diverging_bars.value_range(values[top], values[bottom])
 
-        # Export-Diagramm
-        export_fig = go.Figure()
-        export_fig.add_trace(go.Bar(
-            y=top_4_export_diff['Label'], x=top_4_export_diff['export_differenz'],
-            orientation='h', name='Top 4 Zuwächse', marker_color='green',
-            hovertemplate='Exportzuwachs: %{x:,.0f} €<extra></extra>'
-        ))
-        export_fig.add_trace(go.Bar(
-            y=bottom_4_export_diff['Label'], x=bottom_4_export_diff['export_differenz'],
-            orientation='h', name='Top 4 Rückgänge', marker_color='red',
-            hovertemplate='Exportrückgang: %{x:,.0f} €<extra></extra>'
-        ))
-        export_fig.update_layout(
-            title=f'Exportdifferenzen nach Warengruppe ({selected_year} vs. {selected_year - 1})',
-            xaxis_title='Exportdifferenz (EUR)',
-            xaxis=dict(tickmode='array', tickvals=export_ticks, ticktext=[formatter(val) for val in export_ticks]),
-            yaxis_title='Warengruppe',
-            xaxis_range=[export_diff_min * 1.1, export_diff_max * 1.3],
-        )
+            # Achsenticks generieren
+            ticks, ticktext = axis_ticks.ticks(diff_min, diff_max, step_size)
 
-        # Import-Diagramm
-        import_fig = go.Figure()
-        import_fig.add_trace(go.Bar(
-            y=top_4_import_diff['Label'], x=top_4_import_diff['import_differenz'],
-            orientation='h', name='Top 4 Zuwächse', marker_color='green',
-            hovertemplate='Importzuwachs: %{x:,.0f} €<extra></extra>'
-        ))
-        import_fig.add_trace(go.Bar(
-            y=bottom_4_import_diff['Label'], x=bottom_4_import_diff['import_differenz'],
-            orientation='h', name='Top 4 Rückgänge', marker_color='red',
-            hovertemplate='Importrückgang: %{x:,.0f} €<extra></extra>'
-        ))
-        import_fig.update_layout(
-            title=f'Importdifferenzen nach Warengruppe ({selected_year} vs. {selected_year - 1})',
-            xaxis_title='Importdifferenz (EUR)',
-            xaxis=dict(tickmode='array', tickvals=import_ticks, ticktext=[formatter(val) for val in import_ticks]),
-            yaxis_title='Warengruppe',
-            xaxis_range=[import_diff_min * 1.1, import_diff_max * 1.3],
-        )
+            figures.append(bars.figure(
+                labels[top], values[top], labels[bottom], values[bottom],
+                title=f'{kind}differenzen nach Warengruppe ({selected_year} vs. {selected_year - 1})',
+                xaxis=dict(tickmode='array', tickvals=ticks, ticktext=ticktext,
+                           range=[diff_min * 1.1, diff_max * 1.3])
+            ))
 
-        return export_fig, import_fig
+        return tuple(figures)
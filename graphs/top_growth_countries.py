@@ -1,24 +1,85 @@
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import pandas as pd
-import plotly.graph_objects as go
+import numpy as np
 
-# Daten laden
-df_grouped = pd.read_csv('data/df_grouped.csv')
+import country_index
+import data_store
+import diverging_bars
+import figure_cache
+import year_compare
+import year_range
+
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'top_growth_countries',
+    'title': 'Länder mit größten Export- und Importzuwächsen (relativ)',
+    'nav': ['Überblick über Deutschlands Handel', 'Überblick nach bestimmtem Jahr'],
+    'order': 50,
+    'data': ['df_grouped'],
+}
+
+# Index nur über Länder mit mindestens 100 Mio. € Export oder Import
+def relevant_index():
+    def build():
+        df_grouped = data_store.get('df_grouped')
+        return country_index.CountryIndex(df_grouped[(df_grouped['export_wert'] >= 100_000_000) |
+                                                     (df_grouped['import_wert'] >= 100_000_000)])
+    return data_store.cached('top_growth_countries', build)
+
+# Gemeinsame Figurenbasis für alle drei Kennzahlen
+BARS = diverging_bars.DivergingBars(
+    'Top 4 Wachstum', 'Top 4 Negativwachstum',
+    'Wachstum: %{x:.2f}%<extra></extra>',
+    'Rückgang: %{x:.2f}%<extra></extra>',
+    layout=dict(
+        xaxis={'title': {'text': 'Wachstumsrate (%)'}},
+        yaxis={'title': {'text': 'Land'}},
+        barmode='relative',
+    )
+)
+
+# Kennzahl -> (Titel, Figurenbasis)
+FIGURES = {
+    'export_wachstum': ('Exportwachstum', BARS),
+    'import_wachstum': ('Importwachstum', BARS),
+    'handelsvolumen_wachstum': ('Handelsvolumenwachstum', BARS),
+}
+
+# Durchschnittliches jährliches Wachstum (CAGR) zwischen zwei beliebigen Jahren,
+# wie oben nur für Länder mit mindestens 100 Mio. € Export oder Import im späteren Jahr
+def relevant_countries(data, start, end):
+    return (~np.isin(data.entities, country_index.NON_COUNTRIES)
+            & ((data.values('export_wert', end) >= 100_000_000) | (data.values('import_wert', end) >= 100_000_000)))
+
+RANGE = year_compare.RangeComparison(
+    year_range.countries,
+    {'export_wachstum': 'export_wert', 'import_wachstum': 'import_wert',
+     'handelsvolumen_wachstum': 'handelsvolumen_wert'},
+    year_range.YearRange.cagr,
+    FIGURES,
+    title=lambda title, start, end: f'{title} pro Jahr {start} bis {end} (CAGR)',
+    xaxis=lambda low, high: dict(range=[low * 1.5, high * 1.1]),
+    keep=relevant_countries,
+)
 
 # Layout-Funktion für das Dashboard
 def create_layout():
+    df_grouped = data_store.get('df_grouped')
+    years = sorted(df_grouped['Jahr'].unique())
+
     return html.Div([
         html.H1("Handelswachstum nach Jahr"),
         
         # Dropdown-Menü für Jahrsauswahl
         dcc.Dropdown(
             id='jahr_dropdown_wachstum',
-            options=[{'label': str(j), 'value': j} for j in sorted(df_grouped['Jahr'].unique())],
+            options=[{'label': str(j), 'value': j} for j in years],
             value=2024,  # Standardjahr
             clearable=False,
             style={'width': '50%'}
         ),
+
+        year_compare.dropdown('vergleich_dropdown_wachstum', years),
         
         # Graphen für Export-, Import- und Handelsvolumen-Wachstum
         dcc.Graph(id='export_wachstum_graph'),
@@ -32,63 +93,27 @@ def register_callbacks(app):
         [Output('export_wachstum_graph', 'figure'),
          Output('import_wachstum_graph', 'figure'),
          Output('handelsvolumen_wachstum_graph', 'figure')],
-        Input('jahr_dropdown_wachstum', 'value')
+        [Input('jahr_dropdown_wachstum', 'value'),
+         Input('vergleich_dropdown_wachstum', 'value')]
     )
-    def update_graphs(year_selected):
-        # Filtern der relevanten Länder
-        df_filtered = df_grouped[(df_grouped['Jahr'] == year_selected) & 
-                                 ((df_grouped['export_wert'] >= 100_000_000) | 
-                                  (df_grouped['import_wert'] >= 100_000_000))]
-        df_filtered = df_filtered[~df_filtered['Land'].isin(['Nicht ermittelte Länder und Gebiete', 'Schiffs- und Luftfahrzeugbedarf'])]
-
-        # 1. Export-Wachstum: Top 4 & Bottom 4
-        top_4_export = df_filtered.nlargest(4, 'export_wachstum')
-        bottom_4_export = df_filtered.nsmallest(4, 'export_wachstum')
-        export_min = min(bottom_4_export['export_wachstum'].min(), 0)
-        export_max = max(top_4_export['export_wachstum'].max(), 0)
-
-        # 2. Import-Wachstum: Top 4 & Bottom 4
-        top_4_import = df_filtered.nlargest(4, 'import_wachstum')
-        bottom_4_import = df_filtered.nsmallest(4, 'import_wachstum')
-        import_min = min(bottom_4_import['import_wachstum'].min(), 0)
-        import_max = max(top_4_import['import_wachstum'].max(), 0)
+    @figure_cache.memoize('top_growth_countries', 'df_grouped')
+    def update_graphs(year_selected, compare_year=None):
+        figures = RANGE.figures(year_selected, compare_year)
+        if figures is not None:
+            return figures
 
-        # 3. Handelsvolumen-Wachstum: Top 4 & Bottom 4
-        top_4_handelsvolumen = df_filtered.nlargest(4, 'handelsvolumen_wachstum')
-        bottom_4_handelsvolumen = df_filtered.nsmallest(4, 'handelsvolumen_wachstum')
-        handelsvolumen_min = min(bottom_4_handelsvolumen['handelsvolumen_wachstum'].min(), 0)
-        handelsvolumen_max = max(top_4_handelsvolumen['handelsvolumen_wachstum'].max(), 0)
+        index = relevant_index()
 
-        # Funktion zum Erstellen der Graphen
-        def create_bar_chart(top_df, bottom_df, x_col, title, x_min, x_max):
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                y=top_df['Land'],
-                x=top_df[x_col],
-                orientation='h',
-                name='Top 4 Wachstum',
-                marker_color='green',
-                hovertemplate='Wachstum: %{x:.2f}%<extra></extra>'
-            ))
-            fig.add_trace(go.Bar(
-                y=bottom_df['Land'],
-                x=bottom_df[x_col],
-                orientation='h',
-                name='Top 4 Negativwachstum',
-                marker_color='red',
-                hovertemplate='Rückgang: %{x:.2f}%<extra></extra>'
-            ))
-            fig.update_layout(
+        figures = []
+        for metric, (title, bars) in FIGURES.items():
+            # Top 4 & Bottom 4 der Kennzahl
+            top_labels, top_values, bottom_labels, bottom_values = index.top_bottom(
+                year_selected, metric, 4, country_index.NON_COUNTRIES)
+            x_min, x_max = diverging_bars.value_range(top_values, bottom_values)
+            figures.append(bars.figure(
+                top_labels, top_values, bottom_labels, bottom_values,
                 title=f'{title} für {year_selected}',
-                xaxis_title='Wachstumsrate (%)',
-                yaxis_title='Land',
-                xaxis=dict(range=[x_min * 1.5, x_max * 1.1]),
-                barmode='relative',
-            )
-            return fig
+                xaxis=dict(range=[x_min * 1.5, x_max * 1.1])
+            ))
 
-        return (
-            create_bar_chart(top_4_export, bottom_4_export, 'export_wachstum', 'Exportwachstum', export_min, export_max),
-            create_bar_chart(top_4_import, bottom_4_import, 'import_wachstum', 'Importwachstum', import_min, import_max),
-            create_bar_chart(top_4_handelsvolumen, bottom_4_handelsvolumen, 'handelsvolumen_wachstum', 'Handelsvolumenwachstum', handelsvolumen_min, handelsvolumen_max),
-        )
+        return tuple(figures)
@@ -1,25 +1,72 @@
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import pandas as pd
-import plotly.graph_objects as go
 
-# Daten einlesen
-df_reduced = pd.read_csv('data/df_reduced.csv')
+import data_store
+import diverging_bars
+import figure_cache
+import year_compare
+import year_range
+
+# Seitenbeschreibung für page_registry
+PAGE = {
+    'route': 'top_growth_goods',
+    'title': 'Waren mit größten Export- und Importzuwächsen (relativ)',
+    'nav': ['Überblick über Deutschlands Handel', 'Überblick nach bestimmtem Jahr'],
+    'order': 80,
+    'data': ['goods_yoy'],
+}
+
+# Gemeinsame Achsenangaben beider Diagramme
+AXES = dict(
+    xaxis={'title': {'text': 'Veränderung in %'}, 'tickformat': '.1f', 'tickmode': 'auto'},
+    yaxis={'title': {'text': 'Warengruppe'}},
+)
+
+# Kennzahl -> (Export/Import, Figurenbasis)
+FIGURES = {
+    'export_rel_diff': ('Export', diverging_bars.DivergingBars(
+        'Top 4 Zuwächse', 'Top 4 Rückgänge',
+        'Relative Exportveränderung: %{x:.1f}%<extra></extra>',
+        'Relative Exportrückgang: %{x:.1f}%<extra></extra>',
+        layout=AXES
+    )),
+    'import_rel_diff': ('Import', diverging_bars.DivergingBars(
+        'Top 4 Zuwächse', 'Top 4 Rückgänge',
+        'Relative Importveränderung: %{x:.1f}%<extra></extra>',
+        'Relative Importrückgang: %{x:.1f}%<extra></extra>',
+        layout=AXES
+    )),
+}
+
+# Durchschnittliche jährliche Veränderung (CAGR) zwischen zwei beliebigen Jahren
+RANGE = year_compare.RangeComparison(
+    year_range.goods,
+    {'export_rel_diff': 'Ausfuhr: Wert', 'import_rel_diff': 'Einfuhr: Wert'},
+    year_range.YearRange.cagr,
+    FIGURES,
+    title=lambda kind, start, end: f'Durchschnittliche jährliche {kind}veränderung nach Warengruppe ({start} bis {end}, CAGR)',
+    xaxis=lambda low, high: dict(range=[low * 1.2, high * 1.2]),
+)
 
 # Layout-Funktion für das Graph-Modul
 def create_layout():
+    goods_yoy = data_store.get('goods_yoy')
+    years = sorted(goods_yoy['Jahr'].unique())
+
     return html.Div([
         html.H1("Relative Handelsdifferenzen nach Warengruppe"),
         
         # Dropdown-Menü für Jahrsauswahl
         dcc.Dropdown(
             id='jahr_dropdown_growth_goods',
-            options=[{'label': str(j), 'value': j} for j in sorted(df_reduced['Jahr'].unique())],
+            options=[{'label': str(j), 'value': j} for j in years],
             value=2024,  # Standardjahr
             clearable=False,
             style={'width': '50%'}
         ),
 
+        year_compare.dropdown('vergleich_dropdown_growth_goods', years),
+
         # Graphen für relative Export- und Import-Differenzen
         dcc.Graph(id='export_rel_diff_graph'),
         dcc.Graph(id='import_rel_diff_graph'),
@@ -30,86 +77,43 @@ def register_callbacks(app):
     @app.callback(
         [Output('export_rel_diff_graph', 'figure'),
          Output('import_rel_diff_graph', 'figure')],
-        Input('jahr_dropdown_growth_goods', 'value')
+        [Input('jahr_dropdown_growth_goods', 'value'),
+         Input('vergleich_dropdown_growth_goods', 'value')]
     )
-    def update_graphs(selected_year):
-        df_current = df_reduced[df_reduced['Jahr'] == selected_year]
-        df_previous = df_reduced[df_reduced['Jahr'] == selected_year - 1]
-
-        df_diff = pd.merge(df_current, df_previous, on="Label", suffixes=('_current', '_previous'))
-
-        # Berechnung der relativen Veränderungen in Prozent
-        df_diff['export_rel_diff'] = (df_diff['Ausfuhr: Wert_current'] - df_diff['Ausfuhr: Wert_previous']) / df_diff['Ausfuhr: Wert_previous'] * 100
-        df_diff['import_rel_diff'] = (df_diff['Einfuhr: Wert_current'] - df_diff['Einfuhr: Wert_previous']) / df_diff['Einfuhr: Wert_previous'] * 100
-
-        # Top & Bottom 4 relative Export-Differenzen
-        top_4_export_rel_diff = df_diff.nlargest(4, 'export_rel_diff')
-        bottom_4_export_rel_diff = df_diff.nsmallest(4, 'export_rel_diff')
-        export_rel_min = min(bottom_4_export_rel_diff['export_rel_diff'].min(), 0)
-        export_rel_max = max(top_4_export_rel_diff['export_rel_diff'].max(), 0)
-
-        # Top & Bottom 4 relative Import-Differenzen
-        top_4_import_rel_diff = df_diff.nlargest(4, 'import_rel_diff')
-        bottom_4_import_rel_diff = df_diff.nsmallest(4, 'import_rel_diff')
-        import_rel_min = min(bottom_4_import_rel_diff['import_rel_diff'].min(), 0)
-        import_rel_max = max(top_4_import_rel_diff['import_rel_diff'].max(), 0)
-
-        # Graph für relative Export-Differenzen
-        export_fig = go.Figure()
-
-        export_fig.add_trace(go.Bar(
-            y=top_4_export_rel_diff['Label'],
-            x=top_4_export_rel_diff['export_rel_diff'],
-            orientation='h',
-            name='Top 4 Zuwächse',
-            marker_color='green',
-            hovertemplate='Relative Exportveränderung: %{x:.1f}%<extra></extra>'
-        ))
-
-        export_fig.add_trace(go.Bar(
-            y=bottom_4_export_rel_diff['Label'],
-            x=bottom_4_export_rel_diff['export_rel_diff'],
-            orientation='h',
-            name='Top 4 Rückgänge',
-            marker_color='red',
-            hovertemplate='Relative Exportrückgang: %{x:.1f}%<extra></extra>'
-        ))
-
-        export_fig.update_layout(
-            title=f'Relative Exportdifferenzen nach Warengruppe ({selected_year} vs. {selected_year - 1})',
-            xaxis_title='Veränderung in %',
-            xaxis=dict(tickformat=".1f", tickmode='auto'),
-            yaxis_title='Warengruppe',
-            xaxis_range=[export_rel_min * 1.2, export_rel_max * 1.2],
-        )
-
-        # Graph für relative Import-Differenzen
-        import_fig = go.Figure()
-
-        import_fig.add_trace(go.Bar(
-            y=top_4_import_rel_diff['Label'],
-            x=top_4_import_rel_diff['import_rel_diff'],
-            orientation='h',
-            name='Top 4 Zuwächse',
-            marker_color='green',
-            hovertemplate='Relative Importveränderung: %{x:.1f}%<extra></extra>'
-        ))
-
-        import_fig.add_trace(go.Bar(
-            y=bottom_4_import_rel_diff['Label'],
-            x=bottom_4_import_rel_diff['import_rel_diff'],
-            orientation='h',
-            name='Top 4 Rückgänge',
-            marker_color='red',
-            hovertemplate='Relative Importrückgang: %{x:.1f}%<extra></extra>'
-        ))
-
-        import_fig.update_layout(
-            title=f'Relative Importdifferenzen nach Warengruppe ({selected_year} vs. {selected_year - 1})',
-            xaxis_title='Veränderung in %',
-            xaxis=dict(tickformat=".1f", tickmode='auto'),
-            yaxis_title='Warengruppe',
-            xaxis_range=[import_rel_min * 1.2, import_rel_max * 1.2],
-        )
-
-        return export_fig, import_fig
+    @figure_cache.memoize('top_growth_goods', 'goods_yoy')
+    def update_graphs(selected_year, compare_year=None):
+        figures = RANGE.figures(selected_year, compare_year)
+        if figures is not None:
+            return figures
+
+        # Vorjahresvergleich aus der vorberechneten Tabelle (siehe pipeline.goods_yoy);
+        # ohne Vorjahreswert oder bei einem Vorjahreswert von 0 ist die
+        # relative Veränderung NaN und wird ausgelassen
+        df_diff = data_store.year_slice(data_store.get('goods_yoy'), selected_year)
+        has_previous = df_diff['hat_vorjahr'].any()
+
+        # Top & Bottom 4 für Export und Import in einem Durchgang
+        metrics = list(FIGURES)
+        selection = diverging_bars.select(df_diff[metrics].to_numpy(), 4)
+        labels = df_diff['Label'].to_numpy()
+
+        figures = []
+        for metric, (top, bottom) in zip(metrics, selection):
+            kind, bars = FIGURES[metric]
+            if not has_previous:
+                # Erstes Jahr der Daten: kein Vergleich möglich
+                figures.append(bars.figure(
+                    [], [], [], [],
+                    title=f'Relative {kind}differenzen nach Warengruppe: keine Vorjahreswerte für {selected_year}'
+                ))
+                continue
+
+            values = df_diff[metric].to_numpy()
+            rel_min, rel_max = diverging_bars.value_range(values[top], values[bottom])
+            figures.append(bars.figure(
+                labels[top], values[top], labels[bottom], values[bottom],
+                title=f'Relative {kind}differenzen nach Warengruppe ({selected_year} vs. {selected_year - 1})',
+                xaxis=dict(range=[rel_min * 1.2, rel_max * 1.2])
+            ))
+
+        return tuple(figures)
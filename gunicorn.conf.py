@@ -0,0 +1,18 @@
+# Wird von gunicorn automatisch aus dem Arbeitsverzeichnis geladen:
+#     gunicorn multiple_page_test:server
+import data_cache
+import data_store
+
+
+# Der Binär-Cache wird einmal im Master-Prozess erzeugt, bevor die Worker
+# starten. Mit TRADE_DATA_MMAP=1 blenden alle Worker danach dieselben Dateien ein.
+def on_starting(server):
+    if data_cache.ENABLED:
+        for name in data_store.NAMES:
+            data_store.load(name, mmap=False)
+
+
+# Mit --preload läuft der Hintergrund-Thread von data_store nur im Master;
+# jeder Worker startet nach dem fork seinen eigenen
+def post_fork(server, worker):
+    data_store.start_watcher()
@@ -0,0 +1,116 @@
+# Kompression und HTTP-Caching für die Antworten des Flask-Servers.
+#
+# Alle Antworten der Seiten hängen nur vom Datenstand, vom Programmstand und
+# von der Anfrage selbst ab (die Callbacks sind reine Funktionen ihrer
+# Eingaben). Daraus wird vor der Bearbeitung ein ETag berechnet:
+#     sha1(Programmstand | data_store.data_version() | Methode | Pfad | Query | Body)
+# Schickt der Client diesen ETag in If-None-Match mit, wird sofort mit 304
+# geantwortet, ohne Callback oder Layout zu berechnen. Das gilt für GET
+# (Layout, Abhängigkeiten, /api/data) wie für die POST-Anfragen an
+# /_dash-update-component; Letztere profitieren vor allem hinter einem
+# Reverse-Proxy, der POST-Antworten nach Body zwischenspeichert.
+#
+# Komprimiert wird mit flask-compress (brotli, sonst gzip), falls installiert.
+#
+# Umgebungsvariablen:
+#     TRADE_COMPRESS=0        Kompression abschalten
+#     TRADE_HTTP_MAX_AGE      Sekunden, die Browser/Proxys ohne Rückfrage
+#                             zwischenspeichern dürfen (Standard 0 = immer
+#                             nachfragen, dann 304)
+#     TRADE_RELEASE           feste Kennung des Programmstands (sonst aus den
+#                             Quelldateien berechnet)
+import hashlib
+import os
+
+import flask
+
+import data_store
+
+try:
+    import flask_compress
+except ImportError:
+    flask_compress = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+COMPRESS = flask_compress is not None and os.environ.get('TRADE_COMPRESS') != '0'
+ALGORITHMS = ['br', 'gzip']
+MAX_AGE = int(os.environ.get('TRADE_HTTP_MAX_AGE', '0'))
+
+# Pfade, deren Antworten einen ETag bekommen
+CACHEABLE_PATHS = ['/_dash-update-component', '/_dash-layout', '/_dash-dependencies', '/api/data/']
+
+
+# Kennung des Programmstands aus Größe und Änderungszeit der Quelldateien
+def _release():
+    if os.environ.get('TRADE_RELEASE'):
+        return os.environ['TRADE_RELEASE']
+    parts = []
+    for directory in [ROOT, os.path.join(ROOT, 'graphs'), os.path.join(ROOT, 'assets')]:
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(('.py', '.js', '.css')):
+                stat = os.stat(os.path.join(directory, filename))
+                parts.append(f'{filename}:{stat.st_size}:{stat.st_mtime_ns}')
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:16]
+
+
+RELEASE = _release()
+
+
+def _cacheable():
+    return flask.request.method in ('GET', 'POST') and any(
+        flask.request.path.startswith(path) for path in CACHEABLE_PATHS
+    )
+
+
+def request_etag():
+    request = flask.request
+    digest = hashlib.sha1()
+    for part in [RELEASE, data_store.data_version(), request.method, request.path, request.query_string]:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b'|')
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()[:32]
+
+
+# ETags aus If-None-Match: Tag ohne die Endung, die flask-compress anhängt
+# ("...:gzip"), -> Tag wie vom Client geschickt
+def _client_etags():
+    return {tag.split(':', 1)[0]: tag for tag in flask.request.if_none_match.as_set()}
+
+
+def _cache_control():
+    if MAX_AGE > 0:
+        return f'public, max-age={MAX_AGE}'
+    return 'public, no-cache'
+
+
+def register(server):
+    if COMPRESS:
+        server.config['COMPRESS_ALGORITHM'] = ALGORITHMS
+        server.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/css', 'text/javascript',
+                                               'application/javascript']
+        flask_compress.Compress(server)
+
+    @server.before_request
+    def answer_not_modified():
+        if not _cacheable():
+            return None
+        etag = flask.g.trade_etag = request_etag()
+        client_etags = _client_etags()
+        if etag in client_etags:
+            response = flask.Response(status=304)
+            response.set_etag(client_etags[etag])
+            response.headers['Cache-Control'] = _cache_control()
+            return response
+        return None
+
+    @server.after_request
+    def add_cache_headers(response):
+        etag = flask.g.pop('trade_etag', None)
+        if etag is not None and response.status_code == 200:
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = _cache_control()
+        return response
@@ -0,0 +1,216 @@
+# Inkrementelle Aufnahme neuer Monatsdaten in data/.
+#
+# Eingabe ist eine CSV mit Rohdaten je Land, Warengruppe und Monat:
+#     Jahr,Monat,Land,Code,Label,Ausfuhr: Wert,Einfuhr: Wert
+# Jeder Monat (Jahr, Monat), der in der Eingabe vorkommt, ersetzt diesen Monat
+# vollständig; neue Monate werden angehängt, bereits vorhandene korrigiert.
+# Aktualisiert werden nur die betroffenen Teile:
+#     gesamt_deutschland_monthly, aggregated_df   Zeilen der Monate
+#     1gesamt_deutschland, df_reduced             Zeilen der betroffenen Jahre
+#     df_grouped                                  Jahreswerte der Länder plus
+#                                                 Ränge, Wachstum und Differenz
+#                                                 der betroffenen Jahre und der
+#                                                 jeweiligen Folgejahre
+# Alle übrigen Zeilen werden unverändert zurückgeschrieben.
+#
+# df_grouped enthält nur Jahressummen je Land. Damit ein Monat später erneut
+# eingelesen (korrigiert) werden kann, werden die Monatswerte je Land in
+# data/land_monthly.csv mitgeführt. Für Monate, die vor Einführung dieser
+# Datei entstanden sind, ist keine Korrektur möglich (Fehlermeldung).
+#
+# Alle Dateien werden zuerst vollständig als temporäre Dateien geschrieben und
+# erst danach per os.replace ausgetauscht. Die laufende App bemerkt den neuen
+# Datenstand über data_store.data_version() und lädt ohne Neustart nach.
+#
+# Aufruf aus dem Projektverzeichnis:
+#     python -m ingest neue_monate.csv [--dry-run] [--data-dir data]
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+import data_store
+import pipeline
+
+RAW_COLUMNS = ['Jahr', 'Monat', 'Land', 'Code', 'Label'] + pipeline.VALUE_COLUMNS
+
+LAND_MONTHLY = 'land_monthly.csv'
+
+COUNTRY_VALUES = {'Ausfuhr: Wert': 'export_wert', 'Einfuhr: Wert': 'import_wert'}
+
+
+def read_raw(path):
+    raw = pd.read_csv(path)
+    missing = [column for column in RAW_COLUMNS if column not in raw.columns]
+    if missing:
+        raise ValueError(f'{path}: Spalten fehlen: {", ".join(missing)}')
+    raw = raw[RAW_COLUMNS]
+    if raw.isna().any().any():
+        raise ValueError(f'{path}: fehlende Werte')
+    if not raw['Monat'].between(1, 12).all():
+        raise ValueError(f'{path}: Monat außerhalb von 1-12')
+    return raw.astype({'Jahr': 'int64', 'Monat': 'int64', **{column: 'int64' for column in pipeline.VALUE_COLUMNS}})
+
+
+# Gleitkommawerte mit round_trip lesen, damit unveränderte Zeilen Byte für
+# Byte gleich zurückgeschrieben werden
+def _read(data_dir, filename):
+    return pd.read_csv(os.path.join(data_dir, filename), float_precision='round_trip')
+
+
+def _periods(df):
+    return df['Jahr'].to_numpy() * 100 + df['Monat'].to_numpy()
+
+
+# Zeilen der Monate aus periods durch new ersetzen, sortiert nach by
+def _replace_periods(df, new, periods, by):
+    kept = df[~np.isin(_periods(df), periods)]
+    return pd.concat([kept, new[df.columns]]).sort_values(by, kind='stable', ignore_index=True)
+
+
+# Zeilen der Jahre aus years durch new ersetzen, sortiert nach by
+def _replace_years(df, new, years, by):
+    kept = df[~df['Jahr'].isin(years)]
+    return pd.concat([kept, new[df.columns]]).sort_values(by, kind='stable', ignore_index=True)
+
+
+def _land_monthly(raw):
+    land = raw.groupby(['Land', 'Jahr', 'Monat'], as_index=False)[pipeline.VALUE_COLUMNS].sum()
+    return land.rename(columns=COUNTRY_VALUES)[['Land', 'Jahr', 'Monat', 'export_wert', 'import_wert']]
+
+
+def _update_grouped(grouped, land_monthly, new_land, periods):
+    # Änderung je (Land, Jahr) = neue Monatswerte - bisherige Monatswerte
+    old_land = land_monthly[np.isin(_periods(land_monthly), periods)]
+    delta = pd.concat([new_land, old_land.assign(export_wert=-old_land['export_wert'],
+                                                 import_wert=-old_land['import_wert'])])
+    delta = delta.groupby(['Land', 'Jahr'], as_index=False)[['export_wert', 'import_wert']].sum()
+
+    # Jedes betroffene Jahr enthält alle Länder (neue Jahre/Länder starten bei 0)
+    years = sorted(delta['Jahr'].unique())
+    countries = sorted(set(grouped['Land']) | set(delta['Land']))
+    grid = pd.MultiIndex.from_product([countries, years], names=['Land', 'Jahr']).to_frame(index=False)
+    added = grid.merge(grouped[['Land', 'Jahr']], how='left', indicator=True)
+    added = added[added['_merge'] == 'left_only'].drop(columns='_merge')
+    if len(added):
+        # Übrige Spalten werden für die betroffenen Jahre ohnehin neu berechnet
+        grouped = pd.concat([grouped, added.reindex(columns=grouped.columns, fill_value=0)], ignore_index=True)
+
+    grouped = grouped.merge(delta, on=['Land', 'Jahr'], how='left', suffixes=('', '_delta'))
+    for column in ['export_wert', 'import_wert']:
+        grouped[column] += grouped.pop(f'{column}_delta').fillna(0).astype('int64')
+
+    # Folgejahre mitrechnen, da sich deren Wachstum und Differenz ändern
+    all_years = set(grouped['Jahr'])
+    affected = set(years) | {year + 1 for year in years if year + 1 in all_years}
+    return pipeline.country_yearly(grouped, sorted(affected))
+
+
+# Neue Tabellen nach Aufnahme von raw. frames: Dateiname -> DataFrame
+# (wie aus data/ gelesen); zurückgegeben werden nur die geänderten Dateien.
+def update(frames, raw):
+    monthly = frames['gesamt_deutschland_monthly.csv']
+    periods = np.unique(_periods(raw))
+    years = sorted({int(period) // 100 for period in periods})
+    land_monthly = frames.get(LAND_MONTHLY)
+    if land_monthly is None:
+        land_monthly = pd.DataFrame({'Land': pd.Series(dtype=object), 'Jahr': pd.Series(dtype='int64'),
+                                     'Monat': pd.Series(dtype='int64'), 'export_wert': pd.Series(dtype='int64'),
+                                     'import_wert': pd.Series(dtype='int64')})
+
+    # Vorhandene Monate lassen sich nur mit bekannten Monatswerten je Land korrigieren
+    existing = np.intersect1d(periods, _periods(monthly))
+    unknown = np.setdiff1d(existing, _periods(land_monthly))
+    if len(unknown):
+        names = ', '.join(f'{period // 100}-{period % 100:02d}' for period in unknown)
+        raise ValueError(f'Keine Monatswerte je Land für {names} in {LAND_MONTHLY}, Korrektur nicht möglich')
+
+    goods = raw.groupby(['Jahr', 'Monat', 'Code', 'Label'], as_index=False)[pipeline.VALUE_COLUMNS].sum()
+    goods['Handelsvolumen'] = goods['Ausfuhr: Wert'] + goods['Einfuhr: Wert']
+    aggregated = _replace_periods(frames['aggregated_df.csv'], goods, periods, ['Jahr', 'Monat', 'Code'])
+
+    totals = goods.groupby(['Jahr', 'Monat'], as_index=False)[pipeline.VALUE_COLUMNS].sum()
+    totals = totals.rename(columns=COUNTRY_VALUES)
+    totals['handelsvolumen_wert'] = totals['export_wert'] + totals['import_wert']
+    monthly = _replace_periods(monthly, totals, periods, ['Jahr', 'Monat'])
+
+    yearly = monthly[monthly['Jahr'].isin(years)].groupby('Jahr', as_index=False)[
+        ['export_wert', 'import_wert', 'handelsvolumen_wert']].sum()
+    yearly.columns = ['Jahr', 'gesamt_export', 'gesamt_import', 'gesamt_handelsvolumen']
+    gesamt = _replace_years(frames['1gesamt_deutschland.csv'], yearly, years, ['Jahr'])
+
+    aggregated_years = aggregated[aggregated['Jahr'].isin(years)]
+    reduced = pipeline.reduced(pipeline.goods_yearly(aggregated_years))
+    reduced = _replace_years(frames['df_reduced.csv'], reduced, years, ['Jahr', 'Label'])
+
+    new_land = _land_monthly(raw)
+    grouped = _update_grouped(frames['df_grouped.csv'], land_monthly, new_land, periods)
+    land_monthly = _replace_periods(land_monthly, new_land, periods, ['Jahr', 'Monat', 'Land'])
+
+    return {
+        'gesamt_deutschland_monthly.csv': monthly,
+        'aggregated_df.csv': aggregated,
+        '1gesamt_deutschland.csv': gesamt,
+        'df_reduced.csv': reduced,
+        'df_grouped.csv': grouped,
+        LAND_MONTHLY: land_monthly,
+    }
+
+
+def read_frames(data_dir):
+    filenames = [filename for filename, _ in data_store.DATASETS.values()] + ['df_reduced.csv']
+    frames = {filename: _read(data_dir, filename) for filename in filenames}
+    if os.path.exists(os.path.join(data_dir, LAND_MONTHLY)):
+        frames[LAND_MONTHLY] = _read(data_dir, LAND_MONTHLY)
+    return frames
+
+
+# Erst alle Dateien temporär schreiben, dann austauschen: bricht das
+# Schreiben ab, bleibt der bisherige Datenstand vollständig erhalten
+def write_frames(data_dir, frames):
+    tmp_paths = {}
+    try:
+        for filename, df in frames.items():
+            tmp_path = tmp_paths[filename] = os.path.join(data_dir, f'.{filename}.tmp-{os.getpid()}')
+            df.to_csv(tmp_path, index=False)
+    except BaseException:
+        for tmp_path in tmp_paths.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+    for filename, tmp_path in tmp_paths.items():
+        os.replace(tmp_path, os.path.join(data_dir, filename))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('raw', help='CSV mit Rohdaten je Land, Warengruppe und Monat')
+    parser.add_argument('--data-dir', default=data_store.DATA_DIR)
+    parser.add_argument('--dry-run', action='store_true', help='nur anzeigen, nichts schreiben')
+    args = parser.parse_args()
+
+    raw = read_raw(args.raw)
+    frames = read_frames(args.data_dir)
+    updated = update(frames, raw)
+
+    periods = sorted({(int(year), int(month)) for year, month in zip(raw['Jahr'], raw['Monat'])})
+    print('Monate: ' + ', '.join(f'{year}-{month:02d}' for year, month in periods))
+    for filename, df in updated.items():
+        before = len(frames[filename]) if filename in frames else 0
+        print(f'{filename}: {before} -> {len(df)} Zeilen')
+    if args.dry_run:
+        return
+
+    write_frames(args.data_dir, updated)
+
+    # Binär-Cache vorab neu aufbauen, damit nicht jeder Worker beim ersten
+    # Zugriff selbst die CSV parst
+    if data_cache.ENABLED and os.path.samefile(args.data_dir, data_store.DATA_DIR):
+        for name in data_store.NAMES:
+            data_store.load(name, mmap=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+# Laufzeitmessung für Callbacks und Prometheus-Endpunkt.
+#
+# instrument(app, prefix) liefert eine Hülle um die Dash-App, deren
+# callback() jede angemeldete Funktion misst: Laufzeit, Fehler und die Zahl
+# der gelesenen Zeilen. Gezählt wird dort, wo ein Callback tatsächlich Zeilen
+# auswählt: data_store.year_slice, die Abfragen von country_index und
+# goods_index sowie trade_cube.slice (eine Zeile je Mitglied und Jahr, auch
+# für die Jahresvergleiche aus year_range). Das Laden oder
+# Aufbauen ganzer Datensätze und Indizes zählt nicht mit. Die Größe der Antwort wird nach
+# der Anfrage (after_request) dem zuletzt ausgeführten Callback zugeordnet.
+# register_routes(server) stellt alles unter /metrics im Prometheus-Textformat
+# bereit. Die Werte gelten pro Prozess; bei mehreren gunicorn-Workern liefert
+# jeder Worker seine eigenen Zahlen.
+#
+# Optional werden langsame Aufrufe mit cProfile aufgezeichnet:
+#     TRADE_PROFILE_SLOW_MS   ab dieser Laufzeit (ms) wird das Profil gespeichert
+#     TRADE_PROFILE_SAMPLE    Anteil der Aufrufe, die profiliert werden (Standard 0.1)
+#     TRADE_PROFILE_DIR       Zielverzeichnis der .prof-Dateien (Standard profiles/)
+# Die Dateien lassen sich mit python -m pstats oder snakeviz öffnen.
+import contextvars
+import cProfile
+import functools
+import os
+import random
+import re
+import threading
+import time
+
+import flask
+
+PROFILE_SLOW_MS = float(os.environ.get('TRADE_PROFILE_SLOW_MS', '0'))
+PROFILE_SAMPLE = float(os.environ.get('TRADE_PROFILE_SAMPLE', '0.1'))
+PROFILE_DIR = os.environ.get(
+    'TRADE_PROFILE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+)
+
+# Obergrenzen der Histogramm-Klassen in Sekunden
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Zeilenzähler des laufenden Callbacks (None außerhalb eines Callbacks)
+_rows = contextvars.ContextVar('trade_rows', default=None)
+
+# Callback -> gesammelte Werte
+_stats = {}
+_lock = threading.Lock()
+
+# cProfile kann pro Prozess nur ein Profil gleichzeitig aufzeichnen
+_profile_lock = threading.Lock()
+
+
+def _entry(name):
+    entry = _stats.get(name)
+    if entry is None:
+        entry = _stats[name] = {
+            'calls': 0,
+            'errors': 0,
+            'seconds': 0.0,
+            'buckets': [0] * len(BUCKETS),
+            'rows': 0,
+            'responses': 0,
+            'bytes': 0,
+        }
+    return entry
+
+
+# Wird an den Stellen aufgerufen, die Zeilen auswählen (siehe oben)
+def count_rows(n):
+    counter = _rows.get()
+    if counter is not None:
+        counter[0] += n
+
+
+def _record(name, seconds, rows, failed):
+    with _lock:
+        entry = _entry(name)
+        entry['calls'] += 1
+        entry['errors'] += failed
+        entry['seconds'] += seconds
+        entry['rows'] += rows
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                entry['buckets'][i] += 1
+
+
+def _dump_profile(name, profile, seconds):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    filename = f'{re.sub(r"[^A-Za-z0-9_.-]", "_", name)}-{time.strftime("%Y%m%d-%H%M%S")}-{int(seconds * 1000)}ms.prof'
+    profile.dump_stats(os.path.join(PROFILE_DIR, filename))
+
+
+def _call(name, fn, args, kwargs):
+    profile = None
+    if PROFILE_SLOW_MS > 0 and random.random() < PROFILE_SAMPLE and _profile_lock.acquire(blocking=False):
+        profile = cProfile.Profile()
+    counter = [0]
+    token = _rows.set(counter)
+    failed = True
+    t0 = time.perf_counter()
+    try:
+        if profile is not None:
+            result = profile.runcall(fn, *args, **kwargs)
+        else:
+            result = fn(*args, **kwargs)
+        failed = False
+        return result
+    finally:
+        seconds = time.perf_counter() - t0
+        _rows.reset(token)
+        _record(name, seconds, counter[0], failed)
+        if flask.has_request_context():
+            flask.g.trade_callback = name
+        if profile is not None:
+            try:
+                if seconds * 1000 >= PROFILE_SLOW_MS:
+                    _dump_profile(name, profile, seconds)
+            finally:
+                _profile_lock.release()
+
+
+# Misst eine Funktion unter dem Namen name
+def timed(name):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return _call(name, fn, args, kwargs)
+        return wrapper
+    return decorator
+
+
+# Hülle um die Dash-App für register_callbacks der Seitenmodule. Alles außer
+# callback() wird unverändert an die App durchgereicht.
+class InstrumentedApp:
+    def __init__(self, app, prefix):
+        self._app = app
+        self._prefix = prefix
+
+    def callback(self, *args, **kwargs):
+        register = self._app.callback(*args, **kwargs)
+
+        def decorator(fn):
+            register(timed(f'{self._prefix}.{fn.__name__}')(fn))
+            return fn
+        return decorator
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+
+def instrument(app, prefix):
+    return InstrumentedApp(app, prefix)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render():
+    with _lock:
+        stats = {name: dict(entry, buckets=list(entry['buckets'])) for name, entry in _stats.items()}
+
+    lines = [
+        '# HELP trade_callback_duration_seconds Laufzeit der Dash-Callbacks',
+        '# TYPE trade_callback_duration_seconds histogram',
+    ]
+    for name, entry in sorted(stats.items()):
+        label = f'callback="{_escape(name)}"'
+        for bound, count in zip(BUCKETS, entry['buckets']):
+            lines.append(f'trade_callback_duration_seconds_bucket{{{label},le="{bound}"}} {count}')
+        lines.append(f'trade_callback_duration_seconds_bucket{{{label},le="+Inf"}} {entry["calls"]}')
+        lines.append(f'trade_callback_duration_seconds_sum{{{label}}} {entry["seconds"]:.6f}')
+        lines.append(f'trade_callback_duration_seconds_count{{{label}}} {entry["calls"]}')
+
+    for metric, key, kind, text in [
+        ('trade_callback_errors_total', 'errors', 'counter', 'Callbacks, die mit einer Ausnahme endeten'),
+        ('trade_callback_rows_total', 'rows', 'counter', 'Von den Callbacks ausgewählte Zeilen (Jahresausschnitte und Indexabfragen)'),
+        ('trade_callback_response_bytes_total', 'bytes', 'counter', 'Größe der Antworten in Bytes'),
+        ('trade_callback_responses_total', 'responses', 'counter', 'Ausgelieferte Antworten'),
+    ]:
+        lines.append(f'# HELP {metric} {text}')
+        lines.append(f'# TYPE {metric} {kind}')
+        for name, entry in sorted(stats.items()):
+            lines.append(f'{metric}{{callback="{_escape(name)}"}} {entry[key]}')
+    return '\n'.join(lines) + '\n'
+
+
+def register_routes(server):
+    @server.after_request
+    def record_response_size(response):
+        name = flask.g.pop('trade_callback', None)
+        if name is not None and not response.direct_passthrough:
+            size = response.calculate_content_length() or 0
+            with _lock:
+                entry = _entry(name)
+                entry['responses'] += 1
+                entry['bytes'] += size
+        return response
+
+    @server.route('/metrics')
+    def metrics():
+        return flask.Response(render(), mimetype='text/plain; version=0.0.4')
@@ -1,35 +1,38 @@
 import dash
 from dash import dcc, html
 import dash_bootstrap_components as dbc
-import importlib
-import os
+
+import data_api
+import data_store
+import figure_cache
+import http_cache
+import metrics
+import page_registry
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 server = app.server
 
-# Categories and subcategories navigation structure
+# Every request keeps the data snapshot it started with; a background thread
+# swaps in changed files from data/ (see data_store.py) and precomputes the
+# figures again if warm-up is enabled
+data_store.register(server, on_reload=figure_cache.warm_up if figure_cache.WARMUP else None)
+
+# Year slices of the datasets for the browser (see data_api.py)
+data_api.register_routes(server)
+
+# Callback timings and payload sizes under /metrics (see metrics.py)
+metrics.register_routes(server)
+
+# Compression and ETag/Cache-Control headers (see http_cache.py)
+http_cache.register(server)
+
+# Discover all pages under graphs/ (see page_registry.py)
+page_registry.discover()
+
+# Categories and subcategories navigation structure, built from the PAGE
+# declarations of the graph modules
 def create_nav_structure():
-    return {
-        "Überblick über Deutschlands Handel": {
-            "Gesamtüberblick seit 2008 bis 2024": {
-                "Gesamter Export-, Import- und Handelsvolumen-Verlauf Deutschlands": "gesamt_export_import_volumen"
-            },
-            "Überblick nach bestimmtem Jahr": {
-                "Monatlicher Handelsverlauf": "monthly_trade",
-                "Top 10 Handelspartner": "top_10_trade_partners",
-                "Länder mit größten Export- und Importzuwächsen (absolut)": "top_diff_countries",
-                "Länder mit größten Export- und Importzuwächsen (relativ)": "top_growth_countries",
-                "Top 10 Waren": "top_10_trade_goods",
-                "Waren mit größten Export- und Importzuwächsen (absolut)": "top_diff_goods",
-                "Waren mit größten Export- und Importzuwächsen (relativ)": "top_growth_goods"
-            }
-        },
-        "Länderanalyse": {
-            "Gesamtüberblick seit 2008 bis 2024": {
-                "Gesamter Export-, Import- und Handelsvolumen-Verlauf mit Deutschland": "export_import_with_germany"
-            }
-        }
-    }
+    return page_registry.nav_structure()
 
 categories = create_nav_structure()
 
@@ -76,35 +79,24 @@ app.layout = html.Div([
     ])
 ])
 
-# Dynamically import graph files and render the content
+# Render the content of the registered page for the current URL
 @app.callback(
     dash.dependencies.Output('page-content', 'children'),
     [dash.dependencies.Input('url', 'pathname')]
 )
+@metrics.timed('navigation.render_graph')
 def render_graph(pathname):
-    graph_name = pathname.lstrip('/')
-    try:
-        graph_module = importlib.import_module(f'graphs.{graph_name}')
-        if hasattr(graph_module, 'create_layout'):
-            return graph_module.create_layout()
-        else:
-            return html.Div(f"Graph {graph_name} does not have a create_layout() function"), 404
-    except ModuleNotFoundError:
-        return html.Div(f"Graph {graph_name} not found"), 404
-
-# Register Callbacks only for modules that have register_callbacks function
-graph_modules = [
-    'monthly_trade', 'top_10_trade_partners', 'top_diff_countries', 
-    'top_growth_countries', 'top_diff_goods', 'top_growth_goods', 'top_10_trade_goods'
-]
-
-for module_name in graph_modules:
-    try:
-        module = importlib.import_module(f'graphs.{module_name}')
-        if hasattr(module, 'register_callbacks'):
-            module.register_callbacks(app)
-    except ModuleNotFoundError:
-        print(f"Module {module_name} not found.")
+    graph_name = (pathname or '').lstrip('/')
+    if page_registry.get(graph_name) is None:
+        return html.Div(f"Graph {graph_name} not found")
+    return page_registry.render(graph_name)
+
+# Register the callbacks of all pages up front
+page_registry.register_callbacks(app)
+
+# Optionally precompute all per-year figures before the first request
+if figure_cache.WARMUP:
+    figure_cache.warm_up()
 
 if __name__ == "__main__":
     app.run_server(debug=True)
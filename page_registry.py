@@ -0,0 +1,98 @@
+# Register aller Seiten unter graphs/.
+#
+# Jedes Seitenmodul beschreibt sich selbst über ein PAGE-dict:
+#     PAGE = {
+#         'route': 'monthly_trade',                 # URL-Pfad ohne '/'
+#         'title': 'Monatlicher Handelsverlauf',    # Eintrag in der Navigation
+#         'nav': ['Überblick über Deutschlands Handel', 'Überblick nach bestimmtem Jahr'],
+#         'order': 20,                              # Reihenfolge in der Navigation
+#         'data': ['gesamt_deutschland_monthly'],   # benötigte Datensätze (data_store)
+#         'key': 'Jahr',                            # optional: Spalte des ersten Datensatzes,
+#     }                                             # deren Werte die Callbacks erhalten
+# discover() findet die Module, register_callbacks() meldet ihre Callbacks
+# einmalig bei der App an. Die Datensätze einer Seite werden erst beim ersten
+# Aufruf dieser Seite geladen.
+#
+# Fertige Layouts werden pro Route und Datenstand zwischengespeichert, da sie
+# nur von den (statischen) Daten abhängen. TRADE_LAYOUT_CACHE=0 schaltet das ab.
+import importlib
+import os
+import pkgutil
+
+import plotly.graph_objects as go
+
+import data_store
+import figure_json
+import metrics
+
+LAYOUT_CACHE = os.environ.get('TRADE_LAYOUT_CACHE', '1') != '0'
+
+PACKAGE = 'graphs'
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), PACKAGE)
+
+# Route -> (PAGE-dict, Modul), sortiert nach 'order'
+_pages = {}
+
+
+def discover():
+    pages = []
+    for info in pkgutil.iter_modules([PACKAGE_DIR]):
+        module = importlib.import_module(f'{PACKAGE}.{info.name}')
+        page = getattr(module, 'PAGE', None)
+        if page is not None and hasattr(module, 'create_layout'):
+            pages.append((page, module))
+    for page, module in sorted(pages, key=lambda entry: entry[0]['order']):
+        _pages[page['route']] = (page, module)
+    return list(_pages)
+
+
+# Die Callbacks werden über metrics gemessen und erscheinen dort als <route>.<funktion>
+def register_callbacks(app):
+    for page, module in _pages.values():
+        if hasattr(module, 'register_callbacks'):
+            module.register_callbacks(metrics.instrument(app, page['route']))
+
+
+def get(route):
+    return _pages.get(route)
+
+
+def routes():
+    return list(_pages)
+
+
+def _build_layout(route):
+    page, module = _pages[route]
+    for name in page.get('data', []):
+        data_store.get(name)
+    return module.create_layout()
+
+
+# Wandelt Figuren in einem zwischengespeicherten Layout einmal in reines JSON
+# um, damit plotly sie nicht bei jeder Auslieferung erneut serialisiert
+def _freeze_figures(component):
+    if isinstance(getattr(component, 'figure', None), go.Figure):
+        component.figure = figure_json.loads(figure_json.dumps(component.figure))
+    children = getattr(component, 'children', None)
+    for child in children if isinstance(children, (list, tuple)) else [children]:
+        if child is not None and not isinstance(child, (str, int, float)):
+            _freeze_figures(child)
+    return component
+
+
+# Layout einer Seite; lädt beim ersten Aufruf die von ihr benötigten Datensätze
+def render(route):
+    if not LAYOUT_CACHE:
+        return _build_layout(route)
+    return data_store.cached(('layout', route), lambda: _freeze_figures(_build_layout(route)))
+
+
+# Navigationsbaum {Kategorie: {Unterkategorie: {Titel: Route}}}
+def nav_structure():
+    nav = {}
+    for page, _ in _pages.values():
+        level = nav
+        for name in page['nav']:
+            level = level.setdefault(name, {})
+        level[page['title']] = page['route']
+    return nav
@@ -0,0 +1,116 @@
+# Vorberechnete Tabellen, die aus den Rohdaten in data/ abgeleitet werden.
+#
+# Die Funktionen werden von data_store als abgeleitete Datensätze genutzt
+# (einmal pro Datenstand berechnet und im Binär-Cache abgelegt). Als
+# Build-Schritt erzeugt dieses Skript alle abgeleiteten Tabellen vorab und
+# gleicht data/df_reduced.csv mit ihnen ab:
+#     python -m pipeline
+import os
+
+import numpy as np
+import pandas as pd
+
+# Bei Änderungen an den Berechnungen erhöhen, damit der Binär-Cache neu entsteht
+VERSION = 1
+
+VALUE_COLUMNS = ['Ausfuhr: Wert', 'Einfuhr: Wert']
+
+COUNTRY_KINDS = ['export', 'import', 'handelsvolumen']
+
+# Spaltenreihenfolge von df_grouped.csv
+COUNTRY_COLUMNS = (
+    ['Land', 'Jahr', 'export_wert', 'import_wert', 'handelsvolumen_wert', 'handelsbilanz', 'handelsbilanz_status']
+    + [f'{kind}_ranking' for kind in COUNTRY_KINDS]
+    + [f'{kind}_wachstum' for kind in COUNTRY_KINDS]
+    + [f'{kind}_wachstum_ranking' for kind in COUNTRY_KINDS]
+    + [f'{kind}_differenz' for kind in COUNTRY_KINDS]
+)
+
+
+# Jahressummen je Warengruppe aus den Monatswerten von aggregated_df,
+# inklusive Rang (1 = größter Wert) innerhalb des Jahres.
+# Sortiert nach Jahr und Exportrang.
+def goods_yearly(aggregated_df):
+    df = aggregated_df.groupby(['Jahr', 'Code', 'Label'], as_index=False, observed=True)[VALUE_COLUMNS].sum()
+    df['Handelsvolumen'] = df['Ausfuhr: Wert'] + df['Einfuhr: Wert']
+
+    by_year = df.groupby('Jahr')
+    for column, ranking in [('Ausfuhr: Wert', 'export_ranking'),
+                            ('Einfuhr: Wert', 'import_ranking'),
+                            ('Handelsvolumen', 'handelsvolumen_ranking')]:
+        df[ranking] = by_year[column].rank(ascending=False, method='first').astype('int16')
+
+    return df.sort_values(['Jahr', 'export_ranking'], ignore_index=True)
+
+
+# Jahressummen je Warengruppe ohne Code (Format von df_reduced.csv)
+def reduced(goods_yearly_df):
+    return goods_yearly_df.sort_values(['Jahr', 'Label'], ignore_index=True)[['Jahr', 'Label'] + VALUE_COLUMNS]
+
+
+# Vorjahresvergleich je Warengruppe aus df_reduced in einem Durchgang:
+# absolute Differenz und relative Veränderung in % für Export und Import.
+# Ohne Vorjahreswert (erstes Jahr, neue Warengruppe) sind beide NaN und
+# hat_vorjahr ist False; bei einem Vorjahreswert von 0 ist nur die relative
+# Veränderung NaN. Sortiert nach Jahr und Label (wie df_reduced).
+def goods_yoy(reduced_df):
+    df = reduced_df.sort_values(['Label', 'Jahr'], ignore_index=True)
+    by_label = df.groupby('Label', observed=True)
+    has_previous = (by_label['Jahr'].shift() == df['Jahr'] - 1).to_numpy()
+    df['hat_vorjahr'] = has_previous
+    for column, kind in [('Ausfuhr: Wert', 'export'), ('Einfuhr: Wert', 'import')]:
+        values = df[column].to_numpy(dtype=float)
+        previous = np.where(has_previous, by_label[column].shift().to_numpy(dtype=float), np.nan)
+        df[f'{kind}_differenz'] = values - previous
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df[f'{kind}_rel_diff'] = np.where(previous != 0, (values - previous) / previous * 100, np.nan)
+    return df.sort_values(['Jahr', 'Label'], ignore_index=True)
+
+
+# Abgeleitete Spalten von df_grouped aus export_wert und import_wert:
+# Handelsvolumen und -bilanz, Ränge im Jahr (1 = größter Wert, Gleichstände
+# gemittelt), Wachstum in % und Differenz zum Vorjahr sowie Ränge des
+# Wachstums. Ohne Vorjahr sind Wachstum und Differenz 0.
+# Mit years werden nur diese Jahre neu berechnet (das Vorjahr wird nur
+# gelesen); alle anderen Zeilen bleiben unverändert. Sortiert nach Land und Jahr.
+def country_yearly(df, years=None):
+    df = df.sort_values(['Land', 'Jahr'], ignore_index=True)
+    years = set(df['Jahr'].unique()) if years is None else set(years)
+    context = df[df['Jahr'].isin(years | {year - 1 for year in years})].copy()
+
+    context['handelsvolumen_wert'] = context['export_wert'] + context['import_wert']
+    context['handelsbilanz'] = context['export_wert'] - context['import_wert']
+    context['handelsbilanz_status'] = np.where(context['handelsbilanz'] > 0, 'Überschuss', 'Defizit')
+
+    by_land = context.groupby('Land', observed=True)
+    has_previous = (by_land['Jahr'].shift() == context['Jahr'] - 1).to_numpy()
+    by_year = context.groupby('Jahr')
+    for kind in COUNTRY_KINDS:
+        values = context[f'{kind}_wert']
+        previous = by_land[f'{kind}_wert'].shift().to_numpy()
+        context[f'{kind}_ranking'] = by_year[f'{kind}_wert'].rank(ascending=False, method='average')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = (values.to_numpy() / previous - 1) * 100
+        context[f'{kind}_wachstum'] = np.where(has_previous, growth, 0.0)
+        context[f'{kind}_differenz'] = np.where(has_previous, values.to_numpy() - previous, 0.0)
+    by_year = context.groupby('Jahr')
+    for kind in COUNTRY_KINDS:
+        context[f'{kind}_wachstum_ranking'] = by_year[f'{kind}_wachstum'].rank(ascending=False, method='average')
+
+    target = context.loc[context['Jahr'].isin(years), COUNTRY_COLUMNS]
+    rest = df.loc[~df['Jahr'].isin(years)]
+    if len(rest):
+        target = pd.concat([rest[COUNTRY_COLUMNS], target])
+    return target.sort_values(['Land', 'Jahr'], ignore_index=True)
+
+
+if __name__ == '__main__':
+    import data_store
+
+    for name in data_store.DERIVED:
+        df = data_store.load(name)
+        print(f'{name}: {len(df)} Zeilen')
+
+    # df_reduced.csv für externe Nutzer mit den abgeleiteten Werten abgleichen
+    path = os.path.join(data_store.DATA_DIR, 'df_reduced.csv')
+    data_store.load('df_reduced').to_csv(path, index=False)
@@ -0,0 +1,214 @@
+# OLAP-Würfel über die Handelsdaten: Dimensionen Zeit (Jahr, Quartal, Monat),
+# Warengruppe (Code) und Land, Kennzahlen Export, Import und Handelsvolumen.
+#
+# Die Daten liegen nicht als Land x Warengruppe x Monat vor: aggregated_df
+# enthält Monatswerte je Warengruppe, df_grouped nur Jahreswerte je Land. Der
+# Würfel besteht daher aus zwei Teilwürfeln mit gemeinsamer Zeitachse,
+#     Code x Jahr x Monat x Kennzahl   (aus aggregated_df)
+#     Land x Jahr x Kennzahl           (aus df_grouped)
+# und der Summe über alle Warengruppen als Deutschland gesamt. Land und Code
+# lassen sich deshalb nicht gemeinsam filtern, Länder nur auf Jahresebene.
+# Zusätzlich gibt es die Jahreswerte je Bezeichnung der Warengruppe (Label),
+# dem Schlüssel der Warenseiten (df_reduced, goods_yoy).
+#
+# Monats-, Quartals- und Jahressummen, die kumulierten Werte seit
+# Jahresbeginn (YTD) und die gleitenden 12-Monats-Summen werden beim Aufbau
+# einmal als dichte NumPy-Arrays berechnet; slice() ist danach nur noch
+# Indexierung. Beim Aufbau wird geprüft, dass die Summen
+# gesamt_deutschland_monthly und 1gesamt_deutschland exakt wiedergeben; in
+# der laufenden App wird eine Abweichung nur gemeldet, damit eine Korrektur
+# der veröffentlichten Gesamtwerte nicht alle Seiten lahmlegt.
+#
+# Die Jahresvergleiche der Diff- und Wachstumsseiten (year_range) fragen
+# Länder und Warengruppen über slice() ab.
+#
+# Prüfung und Beispielabfragen aus dem Projektverzeichnis:
+#     python -m trade_cube
+import sys
+
+import numpy as np
+
+import data_store
+import metrics
+
+MEASURES = ['export', 'import', 'handelsvolumen']
+
+# Spalten der Kennzahlen in den Quelltabellen
+GOODS_COLUMNS = ['Ausfuhr: Wert', 'Einfuhr: Wert', 'Handelsvolumen']
+COUNTRY_COLUMNS = ['export_wert', 'import_wert', 'handelsvolumen_wert']
+MONTHLY_COLUMNS = ['export_wert', 'import_wert', 'handelsvolumen_wert']
+YEARLY_COLUMNS = ['gesamt_export', 'gesamt_import', 'gesamt_handelsvolumen']
+
+# Granularität -> Anzahl Perioden pro Jahr
+GRANULARITIES = {'month': 12, 'quarter': 4, 'ytd': 12, 'rolling12': 12, 'year': 1}
+
+# Dimensionen für slice(); None = Deutschland gesamt
+DIMENSIONS = [None, 'Code', 'Label', 'Land']
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+# Summe der letzten 12 Monate über Jahresgrenzen hinweg (als float); NaN,
+# solange das Fenster nicht 12 vorhandene Monate (present: Jahr x Monat) umfasst
+def _rolling12(monthly, axis, present):
+    flat = monthly.reshape(monthly.shape[:axis - 1] + (-1,) + monthly.shape[axis + 1:])
+    flat = np.moveaxis(flat, axis - 1, 0)
+    cumulative = np.zeros((len(flat) + 1,) + flat.shape[1:])
+    np.cumsum(flat, axis=0, out=cumulative[1:])
+    counts = np.concatenate([[0], np.cumsum(present.ravel())])
+
+    rolling = np.full(flat.shape, np.nan)
+    rolling[11:] = cumulative[12:] - cumulative[:-12]
+    rolling[11:][counts[12:] - counts[:-12] < 12] = np.nan
+    return np.moveaxis(rolling, 0, axis - 1).reshape(monthly.shape)
+
+
+# Monat -> Quartal, YTD, gleitende 12 Monate und Jahr entlang der Monatsachse (axis)
+def _rollups(monthly, axis, present):
+    shape = monthly.shape[:axis] + (4, 3) + monthly.shape[axis + 1:]
+    return {
+        'month': _read_only(monthly),
+        'quarter': _read_only(monthly.reshape(shape).sum(axis=axis + 1)),
+        'ytd': _read_only(np.cumsum(monthly, axis=axis)),
+        'rolling12': _read_only(_rolling12(monthly, axis, present)),
+        'year': _read_only(monthly.sum(axis=axis, keepdims=True)),
+    }
+
+
+class TradeCube:
+    def __init__(self, goods_df, countries_df):
+        years = sorted(set(goods_df['Jahr'].unique()) | set(countries_df['Jahr'].unique()))
+        self.years = [int(year) for year in years]
+        self._first = self.years[0]
+        n_years = self.years[-1] - self._first + 1
+
+        # Code x Jahr x Monat x Kennzahl; fehlende Monate bleiben 0
+        code_positions = goods_df['Code'].cat.codes.to_numpy()
+        self.codes = [str(code) for code in goods_df['Code'].cat.categories]
+        labels = goods_df['Label'].astype(str).to_numpy()
+        self.labels = dict(zip(np.asarray(self.codes)[code_positions], labels))
+        year_positions = goods_df['Jahr'].to_numpy().astype(np.intp) - self._first
+        month_positions = goods_df['Monat'].to_numpy().astype(np.intp) - 1
+        goods = np.zeros((len(self.codes), n_years, 12, len(MEASURES)), dtype=np.int64)
+        goods[code_positions, year_positions, month_positions] = goods_df[GOODS_COLUMNS].to_numpy(dtype=np.int64)
+        self.months_present = np.zeros((n_years, 12), dtype=bool)
+        self.months_present[year_positions, month_positions] = True
+        _read_only(self.months_present)
+
+        # Label x Jahr x Kennzahl (Summe der Warengruppen mit dieser Bezeichnung)
+        label_positions = goods_df['Label'].cat.codes.to_numpy()
+        self.goods_labels = [str(label) for label in goods_df['Label'].cat.categories]
+        by_label = np.zeros((len(self.goods_labels), n_years, 1, len(MEASURES)), dtype=np.int64)
+        np.add.at(by_label, (label_positions, year_positions, 0), goods_df[GOODS_COLUMNS].to_numpy(dtype=np.int64))
+
+        # Land x Jahr x Kennzahl, als einzige Periode pro Jahr
+        country_positions = countries_df['Land'].cat.codes.to_numpy()
+        self.countries = [str(country) for country in countries_df['Land'].cat.categories]
+        countries = np.zeros((len(self.countries), n_years, 1, len(MEASURES)), dtype=np.int64)
+        country_years = countries_df['Jahr'].to_numpy().astype(np.intp) - self._first
+        countries[country_positions, country_years, 0] = countries_df[COUNTRY_COLUMNS].to_numpy(dtype=np.int64)
+
+        self._members = {
+            'Code': {code: i for i, code in enumerate(self.codes)},
+            'Label': {label: i for i, label in enumerate(self.goods_labels)},
+            'Land': {country: i for i, country in enumerate(self.countries)},
+        }
+        self._arrays = {
+            None: _rollups(goods.sum(axis=0), 1, self.months_present),
+            'Code': _rollups(goods, 2, self.months_present),
+            'Label': {'year': _read_only(by_label)},
+            'Land': {'year': _read_only(countries)},
+        }
+
+    def members(self, dimension):
+        return list(self._members[dimension])
+
+    # Werte einer Kennzahl als Array (Mitglieder x Jahre x Perioden), für
+    # dimension=None (Deutschland gesamt) ohne die Mitgliederachse.
+    # years und members schränken die Auswahl ein (Standard: alle).
+    def slice(self, measure, granularity='year', dimension=None, members=None, years=None):
+        arrays = self._arrays[dimension]
+        if granularity not in arrays:
+            raise ValueError(f'Granularität {granularity!r} für {dimension or "Deutschland"} nicht verfügbar')
+        array = arrays[granularity]
+        year_positions = np.asarray([year - self._first for year in (self.years if years is None else years)],
+                                    dtype=np.intp)
+        if dimension is None:
+            metrics.count_rows(len(year_positions))
+            return array[year_positions, :, MEASURES.index(measure)]
+        positions = self._members[dimension]
+        member_positions = np.asarray([positions[member] for member in (positions if members is None else members)],
+                                      dtype=np.intp)
+        metrics.count_rows(len(member_positions) * len(year_positions))
+        return array[np.ix_(member_positions, year_positions)][..., MEASURES.index(measure)]
+
+    # Perioden eines Jahres (1-basiert), für die vollständige Daten vorliegen,
+    # z. B. nur Quartale mit allen drei Monaten
+    def periods(self, granularity, year):
+        present = self.months_present[year - self._first]
+        if granularity == 'quarter':
+            present = present.reshape(4, 3).all(axis=1)
+        elif granularity == 'year':
+            present = present.all(keepdims=True)
+        elif granularity == 'rolling12':
+            present = ~np.isnan(self._arrays[None]['rolling12'][year - self._first, :, 0])
+        return np.flatnonzero(present) + 1
+
+    # Prüft die Summen gegen die veröffentlichten Gesamtwerte; ValueError bei Abweichung
+    def validate(self, monthly_df, yearly_df):
+        year_positions = monthly_df['Jahr'].to_numpy().astype(np.intp) - self._first
+        month_positions = monthly_df['Monat'].to_numpy().astype(np.intp) - 1
+        expected = monthly_df[MONTHLY_COLUMNS].to_numpy(dtype=np.int64)
+        monthly = self._arrays[None]['month'][year_positions, month_positions]
+        if self.months_present.sum() != len(monthly_df) or not np.array_equal(monthly, expected):
+            raise ValueError('Würfel: Monatssummen weichen von gesamt_deutschland_monthly ab')
+
+        year_positions = yearly_df['Jahr'].to_numpy().astype(np.intp) - self._first
+        expected = yearly_df[YEARLY_COLUMNS].to_numpy(dtype=np.int64)
+        if not np.array_equal(self._arrays[None]['year'][year_positions, 0], expected):
+            raise ValueError('Würfel: Jahressummen der Warengruppen weichen von 1gesamt_deutschland ab')
+        if not np.array_equal(self._arrays['Land']['year'].sum(axis=0)[year_positions, 0], expected):
+            raise ValueError('Würfel: Jahressummen der Länder weichen von 1gesamt_deutschland ab')
+
+
+def build(strict=True):
+    cube = TradeCube(data_store.get('aggregated_df'), data_store.get('df_grouped'))
+    try:
+        cube.validate(data_store.get('gesamt_deutschland_monthly'), data_store.get('1gesamt_deutschland'))
+    except ValueError as e:
+        if strict:
+            raise
+        print(e, file=sys.stderr)
+    return cube
+
+
+# Würfel über alle Datensätze (einmal pro Datenstand aufgebaut und geprüft;
+# Abweichungen werden gemeldet, aber nicht als Fehler weitergegeben)
+def get():
+    return data_store.cached('trade_cube', lambda: build(strict=False))
+
+
+if __name__ == '__main__':
+    import time
+
+    t0 = time.perf_counter()
+    cube = build()
+    print(f'Aufbau und Prüfung: {(time.perf_counter() - t0) * 1000:.1f} ms, '
+          f'{len(cube.codes)} Warengruppen, {len(cube.countries)} Länder, Jahre {cube.years[0]}-{cube.years[-1]}')
+
+    queries = {
+        'Deutschland, Export je Quartal 2024': lambda: cube.slice('export', 'quarter', years=[2024]),
+        'Deutschland, Import YTD alle Jahre': lambda: cube.slice('import', 'ytd'),
+        'WA87/WA84, Export je Monat 2019-2024': lambda: cube.slice(
+            'export', 'month', 'Code', ['WA87', 'WA84'], range(2019, 2025)),
+        'alle Warengruppen, Handelsvolumen je Jahr': lambda: cube.slice('handelsvolumen', 'year', 'Code'),
+        'alle Länder, Export je Jahr': lambda: cube.slice('export', 'year', 'Land'),
+    }
+    for name, query in queries.items():
+        t0 = time.perf_counter()
+        for _ in range(100):
+            result = query()
+        print(f'{name:<45} {result.shape!s:<16} {(time.perf_counter() - t0) * 10:.3f} ms')
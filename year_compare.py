@@ -0,0 +1,76 @@
+# Vergleich zweier beliebiger Jahre auf den Diff- und Wachstumsseiten.
+#
+# Jede dieser Seiten hat neben der Jahresauswahl ein optionales Dropdown
+# "Vergleich" (dropdown()). Ist dort ein anderes Jahr gewählt, zeigen die
+# Diagramme statt des Vorjahresvergleichs die Werte zwischen den beiden
+# Jahren. RangeComparison baut diese Figuren aus year_range; die Seiten geben
+# nur ihre eigenen Angaben mit:
+#     source   year_range.countries oder year_range.goods
+#     columns  Kennzahl der Seite -> Spalte mit den Jahreswerten
+#     rate     YearRange.diff oder YearRange.cagr
+#     figures  Kennzahl -> (Name, DivergingBars) wie im Vorjahresvergleich
+#     title    (Name, früheres Jahr, späteres Jahr) -> Titel
+#     xaxis    (kleinster, größter Wert) -> Achsenangaben
+#     keep     optional (YearRange, früheres Jahr, späteres Jahr) -> Maske der Einheiten
+from dash import dcc
+import numpy as np
+
+import axis_ticks
+import diverging_bars
+
+# Anzahl der Balken oben und unten
+N = 4
+
+
+# Dropdown für den optionalen Vergleich mit einem beliebigen anderen Jahr statt dem Vorjahr
+def dropdown(id, years):
+    return dcc.Dropdown(
+        id=id,
+        options=[{'label': str(j), 'value': j} for j in years],
+        value=None,
+        placeholder='Vergleich mit Vorjahr',
+        style={'width': '50%'}
+    )
+
+
+# Achse mit Ticks in einer Schrittweite passend zur Spanne, die über mehrere
+# Jahre deutlich größer werden kann als im Vorjahresvergleich
+def span_ticks(low, high):
+    tickvals, ticktext = axis_ticks.ticks(low, high, axis_ticks.step(low, high))
+    return dict(tickmode='array', tickvals=tickvals, ticktext=ticktext)
+
+
+class RangeComparison:
+    def __init__(self, source, columns, rate, figures, title, xaxis, keep=None):
+        self._source = source
+        self._columns = columns
+        self._rate = rate
+        self._figures = figures
+        self._title = title
+        self._xaxis = xaxis
+        self._keep = keep
+
+    # Figuren für das gewählte Jahr im Vergleich mit compare_year (in der
+    # Reihenfolge von figures); None ohne Vergleichsjahr. Der Vergleich mit
+    # dem gewählten Jahr selbst zählt wie keine Auswahl.
+    def figures(self, selected_year, compare_year):
+        if compare_year is None or compare_year == selected_year:
+            return None
+        start, end = sorted((int(compare_year), int(selected_year)))
+        data = self._source()
+        labels = data.entities
+        values = np.column_stack([self._rate(data, self._columns[metric], start, end) for metric in self._figures])
+        if self._keep is not None:
+            keep = self._keep(data, start, end)
+            labels, values = labels[keep], values[keep]
+
+        figures = []
+        for (name, bars), column, (top, bottom) in zip(self._figures.values(), values.T,
+                                                       diverging_bars.select(values, N)):
+            low, high = diverging_bars.value_range(column[top], column[bottom])
+            figures.append(bars.figure(
+                labels[top], column[top], labels[bottom], column[bottom],
+                title=self._title(name, start, end),
+                xaxis=self._xaxis(low, high)
+            ))
+        return tuple(figures)
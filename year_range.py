@@ -0,0 +1,64 @@
+# Vergleiche zwischen zwei beliebigen Jahren (z. B. 2019 gegen 2024).
+#
+# Die Jahreswerte kommen aus dem Handelswürfel (trade_cube): ein Vergleich
+# liest über TradeCube.slice die beiden Jahre für alle Länder bzw.
+# Warengruppen. Differenz und durchschnittliche jährliche Wachstumsrate (CAGR)
+# sind danach Rechnungen auf zwei Spalten, also O(Einheiten), ohne die
+# Tabellen erneut zu filtern oder zu aggregieren. Wie im Würfel zählt ein
+# Jahr ohne Werte als 0.
+import numpy as np
+
+import trade_cube
+
+# Spalten der Seiten -> Kennzahl im Würfel
+MEASURES = {
+    'export_wert': 'export', 'import_wert': 'import', 'handelsvolumen_wert': 'handelsvolumen',
+    'Ausfuhr: Wert': 'export', 'Einfuhr: Wert': 'import',
+}
+
+
+class YearRange:
+    def __init__(self, cube, dimension, entities):
+        self._cube = cube
+        self._dimension = dimension
+        self.entities = np.asarray(entities)
+        self.years = cube.years
+
+    # Werte aller Einheiten in den Jahren start und end
+    def _values(self, column, start, end):
+        for year in (start, end):
+            if year not in self.years:
+                raise KeyError(year)
+        values = self._cube.slice(MEASURES[column], 'year', self._dimension, years=[start, end])
+        return values[:, 0, 0].astype(float), values[:, 1, 0].astype(float)
+
+    # Werte aller Einheiten in einem Jahr
+    def values(self, column, year):
+        return self._values(column, year, year)[0]
+
+    # Wert in end minus Wert in start
+    def diff(self, column, start, end):
+        first, last = self._values(column, start, end)
+        return last - first
+
+    # Durchschnittliche jährliche Wachstumsrate von start bis end in %;
+    # NaN, wenn einer der Werte nicht positiv ist
+    def cagr(self, column, start, end):
+        if end == start:
+            return np.full(len(self.entities), np.nan)
+        first, last = self._values(column, start, end)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = (np.power(last / first, 1 / (end - start)) - 1) * 100
+        return np.where((first > 0) & (last > 0), rate, np.nan)
+
+
+# Länder (Jahreswerte aus df_grouped)
+def countries():
+    cube = trade_cube.get()
+    return YearRange(cube, 'Land', cube.countries)
+
+
+# Warengruppen nach Bezeichnung wie auf den Warenseiten (Jahressummen der Monatswerte)
+def goods():
+    cube = trade_cube.get()
+    return YearRange(cube, 'Label', cube.goods_labels)